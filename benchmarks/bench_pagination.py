@@ -0,0 +1,86 @@
+"""
+Compares offset and keyset (cursor) pagination of the User table at increasing page depths.
+
+Offset pagination makes Postgres walk and discard every row before the page, so its cost grows with the
+depth; keyset pagination seeks straight to the cursor and stays flat. Needs a database reachable through
+DATABASE_URL; users are seeded up to --users if the table is smaller.
+
+Usage:
+    python -m benchmarks.bench_pagination --users 200000 --limit 10 --repeat 20
+"""
+
+import argparse
+import asyncio
+import time
+
+import prisma
+import prisma.models
+import project.pagination
+from prisma import Prisma
+
+
+async def seed(target: int) -> None:
+    existing = await prisma.models.User.prisma().count()
+    for start in range(existing, target, 5000):
+        await prisma.models.User.prisma().create_many(
+            data=[
+                {"username": f"bench-user-{i}@example.com"}
+                for i in range(start, min(start + 5000, target))
+            ],
+            skip_duplicates=True,
+        )
+
+
+async def timed(repeat: int, query) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await query()
+    return (time.perf_counter() - started) / repeat
+
+
+async def run(users: int, limit: int, repeat: int) -> None:
+    db = Prisma(auto_register=True)
+    await db.connect()
+    try:
+        await seed(users)
+        actions = prisma.models.User.prisma()
+        total = await actions.count()
+        print(f"{'page':>10} {'offset ms':>10} {'cursor ms':>10}")
+        page = 1
+        while (page - 1) * limit < total:
+            # The cursor of a deep page is whatever the previous page handed out; fetching it is setup.
+            anchor = await actions.find_many(
+                skip=(page - 1) * limit - 1 if page > 1 else 0,
+                take=1,
+                order=[{"createdAt": "asc"}, {"id": "asc"}],
+            )
+            cursor = (
+                project.pagination.encode_cursor(anchor[0], "next")
+                if page > 1
+                else None
+            )
+            offset_seconds = await timed(
+                repeat, lambda: project.pagination.offset_page(actions, page, limit)
+            )
+            cursor_seconds = await timed(
+                repeat, lambda: project.pagination.keyset_page(actions, limit, cursor)
+            )
+            print(
+                f"{page:>10} {offset_seconds * 1000:>10.2f} {cursor_seconds * 1000:>10.2f}"
+            )
+            page *= 10
+    finally:
+        await db.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
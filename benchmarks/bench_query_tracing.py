@@ -0,0 +1,84 @@
+"""
+Measures the per-query overhead of the query tracing layer.
+
+A stand-in client whose ``_execute`` returns immediately is called untraced, traced, and traced with
+span export to a temporary file, inside and outside a simulated request. The difference per call is
+the cost tracing adds to every Prisma query.
+
+Usage:
+    python -m benchmarks.bench_query_tracing --calls 200000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import project.query_tracing
+
+
+class FakeModel:
+    pass
+
+
+FakeModel.__name__ = "User"
+
+
+class FakeClient:
+    async def _execute(self, *, method, arguments, model=None, root_selection=None):
+        return None
+
+
+async def _time(calls: int) -> float:
+    client = FakeClient()
+    started = time.perf_counter()
+    for _ in range(calls):
+        await client._execute(method="find_many", arguments={}, model=FakeModel)
+    return (time.perf_counter() - started) / calls
+
+
+async def run(calls: int) -> None:
+    baseline = await _time(calls)
+    print(f"untraced:           {baseline * 1e6:6.2f} us/call")
+
+    tracer = project.query_tracing.QueryTracer()
+    tracer.instrument(FakeClient)
+    background = await _time(calls)
+    scope = {"type": "http", "method": "GET", "path": "/v2/users", "headers": []}
+    token = project.query_tracing._request.set(
+        (scope, *project.query_tracing._parent(scope))
+    )
+    in_request = await _time(calls)
+    tracer.uninstrument()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "spans.jsonl")
+        exporting = project.query_tracing.QueryTracer(
+            exporter=project.query_tracing.SpanExporter(path, 256, "bench")
+        )
+        exporting.instrument(FakeClient)
+        exported = await _time(calls)
+        exporting.uninstrument()
+        exporting.exporter.flush()
+    project.query_tracing._request.reset(token)
+
+    for label, elapsed in (
+        ("traced, background", background),
+        ("traced, request", in_request),
+        ("traced + spans", exported),
+    ):
+        print(
+            f"{label + ':':20}{elapsed * 1e6:6.2f} us/call  (+{(elapsed - baseline) * 1e6:.2f} us)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
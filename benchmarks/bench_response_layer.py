@@ -0,0 +1,128 @@
+"""
+Measures the per-request overhead of the response layer on /ping- and /users-shaped payloads.
+
+"before" reproduces the original handlers: the route returns the service's model and FastAPI re-validates
+it against ``response_model`` and runs ``jsonable_encoder`` before encoding. "after" returns a
+ModelResponse, which pydantic-core encodes once. Services are replaced by canned models so only the HTTP
+and serialisation path is measured; requests go through the full ASGI stack in-process.
+
+Usage:
+    python -m benchmarks.bench_response_layer --requests 5000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import httpx
+import project.responses
+from fastapi import FastAPI
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+class PingResponse(BaseModel):
+    response_message: str
+
+
+class User(BaseModel):
+    id: str
+    createdAt: datetime
+    updatedAt: datetime
+    username: str
+    role: str
+
+
+class GetUsersResponse(BaseModel):
+    users: List[User]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def users_page(limit: int) -> GetUsersResponse:
+    now = datetime.now(timezone.utc)
+    return GetUsersResponse(
+        users=[
+            User(
+                id=f"00000000-0000-0000-0000-{i:012d}",
+                createdAt=now,
+                updatedAt=now,
+                username=f"user-{i}@example.com",
+                role="API_USER",
+            )
+            for i in range(limit)
+        ],
+        next_cursor="WyJuZXh0IiwgIjIwMjQtMDEtMDFUMDA6MDA6MDArMDA6MDAiLCAiaWQiXQ",
+    )
+
+
+def before_app(page: GetUsersResponse) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/ping", response_model=PingResponse)
+    async def ping(user_message: str) -> PingResponse | Response:
+        return PingResponse(response_message=f"pong: {user_message}")
+
+    @app.get("/users", response_model=GetUsersResponse)
+    async def users() -> GetUsersResponse | Response:
+        return page
+
+    return app
+
+
+def after_app(page: GetUsersResponse) -> FastAPI:
+    app = FastAPI(default_response_class=project.responses.ModelResponse)
+    project.responses.install_error_handlers(app)
+
+    @app.post("/ping", response_model=PingResponse)
+    async def ping(user_message: str) -> Response:
+        return project.responses.ModelResponse(
+            PingResponse(response_message=f"pong: {user_message}")
+        )
+
+    @app.get("/users", response_model=GetUsersResponse)
+    async def users() -> Response:
+        return project.responses.ModelResponse(page)
+
+    return app
+
+
+async def measure(app: FastAPI, method: str, url: str, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for _ in range(100):
+            await client.request(method, url)
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.request(method, url)
+        return (time.perf_counter() - started) / requests
+
+
+async def run(requests: int, limit: int) -> None:
+    page = users_page(limit)
+    apps = {"before": before_app(page), "after": after_app(page)}
+    endpoints = [("POST", "/ping?user_message=hello"), ("GET", "/users")]
+    print(f"{'endpoint':<28} {'before us':>10} {'after us':>10} {'saved':>7}")
+    for method, url in endpoints:
+        before = await measure(apps["before"], method, url, requests)
+        after = await measure(apps["after"], method, url, requests)
+        print(
+            f"{method + ' ' + url:<28} {before * 1e6:>10.1f} {after * 1e6:>10.1f}"
+            f" {(1 - after / before) * 100:>6.1f}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=50, help="users per /users page")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.limit))
+
+
+if __name__ == "__main__":
+    main()
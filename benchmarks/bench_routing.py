@@ -0,0 +1,83 @@
+"""
+Measures routing and dispatch cost per endpoint of project.server:app.
+
+Routing replays Starlette's linear route scan for every registered method and path, so the cost of a route
+depends on how many routes precede it. Dispatch sends full requests through the ASGI stack for endpoints that
+answer without the database (the metrics endpoint and the 401 of the authenticated ping routes).
+
+Usage:
+    python -m benchmarks.bench_routing --iterations 20000
+"""
+
+import argparse
+import asyncio
+import re
+import time
+
+import httpx
+import project.server
+from starlette.routing import Match, Route
+
+
+def scope_for(method: str, path: str) -> dict:
+    return {
+        "type": "http",
+        "method": method,
+        "path": re.sub(r"\{[^}]+\}", "00000000-0000-0000-0000-000000000000", path),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+    }
+
+
+def route_scan(scope: dict) -> None:
+    for route in project.server.app.router.routes:
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return
+
+
+def bench_routing(iterations: int) -> None:
+    print(f"{'route':<48} {'position':>8} {'match us':>9}")
+    for position, route in enumerate(project.server.app.router.routes):
+        if not isinstance(route, Route) or not route.methods:
+            continue
+        method = sorted(route.methods - {"HEAD"})[0]
+        scope = scope_for(method, route.path)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            route_scan(scope)
+        elapsed = (time.perf_counter() - started) / iterations
+        print(f"{method + ' ' + route.path:<48} {position:>8} {elapsed * 1e6:>9.2f}")
+
+
+async def bench_dispatch(iterations: int) -> None:
+    requests = [("GET", "/metrics")] + [
+        ("POST", f"{prefix}/ping?user_message=hello") for prefix in ("", "/v1", "/v2")
+    ]
+    transport = httpx.ASGITransport(app=project.server.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        print(f"\n{'request':<48} {'status':>8} {'dispatch us':>11}")
+        for method, url in requests:
+            response = await client.request(method, url)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await client.request(method, url)
+            elapsed = (time.perf_counter() - started) / iterations
+            print(
+                f"{method + ' ' + url:<48} {response.status_code:>8} {elapsed * 1e6:>11.1f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    bench_routing(args.iterations)
+    asyncio.run(bench_dispatch(max(1, args.iterations // 10)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compares cold and warm access token verification throughput.
+
+Cold verification decodes the JWT, checks its signature and looks up the user; warm verification is
+served from the verified-token cache. The user lookup is simulated with a configurable delay so the
+benchmark runs without a database.
+
+Usage:
+    python -m benchmarks.bench_token_verification --tokens 1000 --rounds 20 --lookup-ms 1
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+import prisma.enums
+import project.authenticateRequest_service
+import project.token_verification
+
+
+class SimulatedLookupVerifier(project.token_verification.TokenVerifier):
+    def __init__(self, lookup_seconds: float, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.lookup_seconds = lookup_seconds
+
+    async def load_user(
+        self, user_id: str
+    ) -> Optional[project.token_verification.AuthenticatedUser]:
+        if self.lookup_seconds:
+            await asyncio.sleep(self.lookup_seconds)
+        return project.token_verification.AuthenticatedUser(
+            id=user_id, username=f"user-{user_id}", role=prisma.enums.UserRole.API_USER
+        )
+
+
+async def run(tokens: int, rounds: int, lookup_ms: float) -> None:
+    issued = [
+        project.authenticateRequest_service.create_access_token(str(i), f"user-{i}")
+        for i in range(tokens)
+    ]
+
+    # A zero max_age expires every entry immediately, so each verification takes the uncached path.
+    cold = SimulatedLookupVerifier(lookup_ms / 1000, max_entries=tokens, max_age=0)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for token in issued:
+            await cold.verify(token)
+    cold_elapsed = time.perf_counter() - started
+
+    warm = SimulatedLookupVerifier(lookup_ms / 1000, max_entries=tokens, max_age=300)
+    for token in issued:
+        await warm.verify(token)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for token in issued:
+            await warm.verify(token)
+    warm_elapsed = time.perf_counter() - started
+
+    total = tokens * rounds
+    print(f"verifications: {total} ({tokens} distinct tokens, lookup {lookup_ms} ms)")
+    print(
+        f"cold: {total / cold_elapsed:12.0f} ops/s  {cold_elapsed / total * 1e6:8.1f} us/op"
+    )
+    print(
+        f"warm: {total / warm_elapsed:12.0f} ops/s  {warm_elapsed / total * 1e6:8.1f} us/op"
+    )
+    print(f"speed-up: {cold_elapsed / warm_elapsed:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--lookup-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.tokens, args.rounds, args.lookup_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""
+Load-tests the API end to end and records a per-endpoint latency and throughput baseline.
+
+Starts ``project.server:app`` under uvicorn against the database in DATABASE_URL, seeds users and the
+SECURITY module the ping endpoints need, then drives a traffic mix with --concurrency clients for
+--duration seconds. p50/p95/p99 latency and throughput are reported per endpoint and saved as JSON in
+--results-dir, named after the git commit, so two runs can be compared with --compare.
+
+Traffic mixes:
+    ping     authenticated pings, with some batches
+    admin    user listing, detail lookups, creates, updates and logins
+    mixed    mostly pings with a share of every admin operation
+
+--replay takes a JSONL file of recorded requests instead, one object per line:
+    {"method": "GET", "path": "/v2/users/{userId}", "params": {"messages_limit": 10}}
+    {"method": "POST", "path": "/v2/ping", "params": {"user_message": "hi"}, "auth": true}
+``{userId}`` is replaced by a random seeded user, ``auth`` sends a seeded user's access token and an
+optional ``json`` key is sent as the request body. Lines are replayed in order, looping until the time
+is up.
+
+Usage:
+    python -m benchmarks.load_test --mix mixed --duration 30 --concurrency 32
+    python -m benchmarks.load_test --mix ping --compare benchmarks/results/<sha>-ping.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import prisma
+import prisma.models
+import project.authenticateRequest_service
+import project.password_hashing
+from prisma import Prisma
+
+PASSWORD = "load-test-password"
+
+SEED_PREFIX = "load-test-"
+
+RUN_PREFIX = "load-run-"
+
+
+class Fixtures:
+    """
+    The seeded users the traffic mixes act as.
+    """
+
+    def __init__(self, users: List[Tuple[str, str]]) -> None:
+        self.users = users
+        self.tokens = {
+            user_id: project.authenticateRequest_service.create_access_token(
+                user_id, username
+            )
+            for user_id, username in users
+        }
+
+    def user(self) -> Tuple[str, str]:
+        return random.choice(self.users)
+
+    def auth(self, user_id: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[user_id]}"}
+
+
+# A request is (endpoint label, method, url, params, headers, json body).
+Request = Tuple[str, str, str, Dict[str, Any], Dict[str, str], Any]
+
+
+def _ping(f: Fixtures) -> Request:
+    user_id, _ = f.user()
+    return (
+        "POST /v2/ping",
+        "POST",
+        "/v2/ping",
+        {"user_message": "hello"},
+        f.auth(user_id),
+        None,
+    )
+
+
+def _ping_batch(f: Fixtures) -> Request:
+    user_id, _ = f.user()
+    body = [f"hello {i}" for i in range(20)]
+    return ("POST /v2/ping/batch", "POST", "/v2/ping/batch", {}, f.auth(user_id), body)
+
+
+def _list_users(f: Fixtures) -> Request:
+    return ("GET /v2/users", "GET", "/v2/users", {"limit": 20}, {}, None)
+
+
+def _user_details(f: Fixtures) -> Request:
+    user_id, _ = f.user()
+    return (
+        "GET /v2/users/{userId}",
+        "GET",
+        f"/v2/users/{user_id}",
+        {"messages_limit": 20},
+        {},
+        None,
+    )
+
+
+def _create_user(f: Fixtures) -> Request:
+    username = f"{RUN_PREFIX}{uuid.uuid4().hex}@example.com"
+    params = {"name": "Load Test", "email": username, "password": PASSWORD}
+    return ("POST /v2/users", "POST", "/v2/users", params, {}, None)
+
+
+def _update_user(f: Fixtures) -> Request:
+    user_id, username = f.user()
+    params = {"name": "Load Test", "email": username, "role": "API_USER"}
+    return (
+        "PUT /v2/users/{userId}",
+        "PUT",
+        f"/v2/users/{user_id}",
+        params,
+        {},
+        None,
+    )
+
+
+def _authenticate(f: Fixtures) -> Request:
+    _, username = f.user()
+    params = {"username": username, "password": PASSWORD}
+    return ("POST /v2/authenticate", "POST", "/v2/authenticate", params, {}, None)
+
+
+MIXES = {
+    "ping": [(_ping, 90), (_ping_batch, 10)],
+    "admin": [
+        (_list_users, 35),
+        (_user_details, 35),
+        (_create_user, 10),
+        (_update_user, 10),
+        (_authenticate, 10),
+    ],
+    "mixed": [
+        (_ping, 60),
+        (_ping_batch, 5),
+        (_list_users, 10),
+        (_user_details, 15),
+        (_create_user, 3),
+        (_update_user, 3),
+        (_authenticate, 4),
+    ],
+}
+
+
+def mix_source(name: str, fixtures: Fixtures):
+    makers, weights = zip(*MIXES[name])
+    while True:
+        yield random.choices(makers, weights)[0](fixtures)
+
+
+def replay_source(path: str, fixtures: Fixtures):
+    with open(path, encoding="utf-8") as f:
+        recorded = [json.loads(line) for line in f if line.strip()]
+    if not recorded:
+        raise ValueError(f"{path} contains no requests.")
+    for entry in itertools.cycle(recorded):
+        user_id, _ = fixtures.user()
+        method = entry.get("method", "GET").upper()
+        path = entry["path"]
+        yield (
+            f"{method} {path}",
+            method,
+            path.replace("{userId}", user_id),
+            entry.get("params", {}),
+            fixtures.auth(user_id) if entry.get("auth") else {},
+            entry.get("json"),
+        )
+
+
+async def seed(users: int) -> List[Tuple[str, str]]:
+    """
+    Makes sure the SECURITY module is enabled for API users and that ``users`` load-test users exist.
+    """
+    module = await prisma.models.Module.prisma().find_first(
+        where={"name": "SECURITY", "enabled": True}
+    )
+    if module is None:
+        module = await prisma.models.Module.prisma().create(
+            data={"name": "SECURITY", "description": "Load test security module"}
+        )
+    role = await prisma.models.ModuleRole.prisma().find_first(
+        where={"moduleId": module.id, "role": "API_USER"}
+    )
+    if role is None:
+        await prisma.models.ModuleRole.prisma().create(
+            data={"moduleId": module.id, "role": "API_USER"}
+        )
+    hashed = await project.password_hashing.password_hasher.hash(PASSWORD)
+    await prisma.models.User.prisma().create_many(
+        data=[
+            {"username": f"{SEED_PREFIX}{i}@example.com", "password": hashed}
+            for i in range(users)
+        ],
+        skip_duplicates=True,
+    )
+    rows = await prisma.models.User.prisma().find_many(
+        where={"username": {"startswith": SEED_PREFIX}},
+        take=users,
+    )
+    return [(row.id, row.username) for row in rows]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_server(port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "project.server:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ]
+    )
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError("The server exited during startup.")
+            try:
+                if (await client.get("/health/ready")).status_code == 200:
+                    return server
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("The server did not become ready within 60 seconds.")
+
+
+async def drive(
+    base_url: str,
+    source,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> Tuple[Dict[str, List[float]], Dict[str, int]]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    stop_at = measure_from + duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        while loop.time() < stop_at:
+            label, method, url, params, headers, body = next(source)
+            started = loop.time()
+            try:
+                response = await client.request(
+                    method, url, params=params, headers=headers, json=body
+                )
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            if started < measure_from:
+                continue
+            latencies[label].append(loop.time() - started)
+            if failed:
+                errors[label] += 1
+
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30
+    ) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarise(samples: List[float], errors: int, duration: float) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": len(ordered) / duration,
+        "p50_ms": _quantile(ordered, 0.50) * 1000,
+        "p95_ms": _quantile(ordered, 0.95) * 1000,
+        "p99_ms": _quantile(ordered, 0.99) * 1000,
+    }
+
+
+def git_revision() -> Tuple[str, bool]:
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return sha, dirty
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(
+        f"{'endpoint':32} {'requests':>9} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for label, stats in [*result["endpoints"].items(), ("total", result["total"])]:
+        print(
+            f"{label:32} {stats['requests']:9d} {stats['errors']:7d} "
+            f"{stats['throughput_rps']:9.1f} {stats['p50_ms']:8.2f} "
+            f"{stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f}"
+        )
+
+
+def print_comparison(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"\nchange against {baseline['git_sha']} ({baseline['started_at']}):")
+    print(f"{'endpoint':32} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = [*result["endpoints"].items(), ("total", result["total"])]
+    for label, stats in rows:
+        before = (
+            baseline["total"] if label == "total" else baseline["endpoints"].get(label)
+        )
+        if before is None:
+            print(f"{label:32} {'(new)':>9}")
+            continue
+        changes = [
+            (stats[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+        ]
+        print(f"{label:32} " + " ".join(f"{c:+8.1f}%" for c in changes))
+
+
+async def cleanup() -> None:
+    await prisma.models.User.prisma().delete_many(
+        where={"username": {"startswith": RUN_PREFIX}}
+    )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    db = Prisma(auto_register=True)
+    await db.connect()
+    server: Optional[subprocess.Popen] = None
+    try:
+        fixtures = Fixtures(await seed(args.users))
+        source = (
+            replay_source(args.replay, fixtures)
+            if args.replay
+            else mix_source(args.mix, fixtures)
+        )
+        base_url = args.base_url
+        if base_url is None:
+            port = args.port or _free_port()
+            server = await start_server(port, args.workers)
+            base_url = f"http://127.0.0.1:{port}"
+        started_at = datetime.now(timezone.utc).isoformat()
+        latencies, errors = await drive(
+            base_url, source, args.concurrency, args.duration, args.warmup
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if not args.keep_data:
+            await cleanup()
+        await db.disconnect()
+        project.password_hashing.password_hasher.shutdown()
+    sha, dirty = git_revision()
+    return {
+        "git_sha": sha,
+        "dirty": dirty,
+        "started_at": started_at,
+        "mix": f"replay:{os.path.basename(args.replay)}" if args.replay else args.mix,
+        "config": {
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "users": args.users,
+        },
+        "endpoints": {
+            label: summarise(samples, errors[label], args.duration)
+            for label, samples in sorted(latencies.items())
+        },
+        "total": summarise(
+            [s for samples in latencies.values() for s in samples],
+            sum(errors.values()),
+            args.duration,
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--replay", help="JSONL file of recorded requests")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--port", type=int)
+    parser.add_argument(
+        "--base-url", help="test an already running server instead of starting one"
+    )
+    parser.add_argument("--results-dir", default=os.path.join("benchmarks", "results"))
+    parser.add_argument("--compare", help="results file of an earlier run")
+    parser.add_argument(
+        "--keep-data", action="store_true", help="keep the users created during the run"
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_report(result)
+    os.makedirs(args.results_dir, exist_ok=True)
+    suffix = "-dirty" if result["dirty"] else ""
+    mix = result["mix"].replace(":", "-")
+    path = os.path.join(args.results_dir, f"{result['git_sha']}{suffix}-{mix}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nresults saved to {path}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+import prisma
+import prisma.enums
+import prisma.errors
+import prisma.models
+import project.ndjson
+import project.password_hashing
+import project.user_count
+from pydantic import BaseModel, Field, ValidationError
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.environ.get("BULK_IMPORT_BATCH_SIZE", "500"))
+
+MAX_ROWS = int(os.environ.get("BULK_IMPORT_MAX_ROWS", "100000"))
+
+FORMATS = ("csv", "ndjson")
+
+# Bulk imports together keep at most this many passwords in the hashing pool, leaving the rest of its
+# capacity to interactive logins and sign-ups.
+_hash_slots = asyncio.Semaphore(project.password_hashing.password_hasher.workers * 2)
+
+
+class BulkImportRow(BaseModel):
+    """
+    One user to import. The email is the login username, as with createUser.
+    """
+
+    name: str
+    email: str = Field(min_length=1)
+    password: str = Field(min_length=1)
+    role: prisma.enums.UserRole = prisma.enums.UserRole.API_USER
+
+
+# A parsed row is (row number, record, error); the record is None when the row could not be parsed.
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+async def _ndjson_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    number = 0
+    async for line in project.ndjson.iter_lines(chunks):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object."
+            continue
+        yield number, record, None
+
+
+async def _csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    header: Optional[List[str]] = None
+    number = 0
+    async for line in project.ndjson.iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            fields = next(csv.reader([line.decode("utf-8")]))
+        except (UnicodeDecodeError, csv.Error) as e:
+            fields, error = None, f"Invalid CSV: {e}"
+        else:
+            error = None
+        if header is None:
+            if fields is None:
+                raise ValueError(error)
+            header = [field.strip() for field in fields]
+            continue
+        number += 1
+        if fields is None:
+            yield number, None, error
+        elif len(fields) != len(header):
+            yield number, None, f"Expected {len(header)} columns, got {len(fields)}."
+        else:
+            yield number, {k: v for k, v in zip(header, fields) if v != ""}, None
+
+
+def _report(row: int, error: str, email: Optional[str] = None) -> bytes:
+    line = {"row": row, "error": error}
+    if email is not None:
+        line["email"] = email
+    return json.dumps(line).encode("utf-8") + b"\n"
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+async def _hash(password: str) -> str:
+    async with _hash_slots:
+        while True:
+            try:
+                return await project.password_hashing.password_hasher.hash(password)
+            except project.password_hashing.HashingPoolSaturatedError:
+                # Interactive requests filled the pool; wait for room rather than failing the row.
+                await asyncio.sleep(0.05)
+
+
+async def _insert(batch: List[Tuple[int, BulkImportRow]]) -> Tuple[int, List[bytes]]:
+    reports = []
+    unique: Dict[str, Tuple[int, BulkImportRow]] = {}
+    for number, row in batch:
+        if row.email in unique:
+            reports.append(
+                _report(
+                    number,
+                    f"Duplicate of row {unique[row.email][0]}.",
+                    row.email,
+                )
+            )
+        else:
+            unique[row.email] = (number, row)
+    existing = await prisma.models.User.prisma().find_many(
+        where={"username": {"in": list(unique)}}
+    )
+    for user in existing:
+        number, _ = unique.pop(user.username)
+        reports.append(_report(number, "User already exists.", user.username))
+    rows = list(unique.values())
+    hashed = await asyncio.gather(*(_hash(row.password) for _, row in rows))
+    created = 0
+    if rows:
+        created = await prisma.models.User.prisma().create_many(
+            data=[
+                {"username": row.email, "password": password, "role": row.role}
+                for (_, row), password in zip(rows, hashed)
+            ],
+            skip_duplicates=True,
+        )
+    if created < len(rows):
+        reports.append(
+            _report(
+                rows[0][0],
+                f"{len(rows) - created} rows between rows {rows[0][0]} and {rows[-1][0]} were "
+                "created concurrently by another request and skipped.",
+            )
+        )
+    return created, reports
+
+
+async def _flush(batch: List[Tuple[int, BulkImportRow]]) -> Tuple[int, List[bytes]]:
+    try:
+        return await _insert(batch)
+    except prisma.errors.PrismaError as e:
+        # One failed batch must not abort the rest of the import.
+        logger.exception("Bulk import of %d rows failed", len(batch))
+        return 0, [
+            _report(number, f"Insert failed: {e}", row.email) for number, row in batch
+        ]
+
+
+async def _import_lines(rows: AsyncIterable[ParsedRow]) -> AsyncIterator[bytes]:
+    total = created = failed = 0
+    batch: List[Tuple[int, BulkImportRow]] = []
+    try:
+        async for number, record, error in rows:
+            if total == MAX_ROWS:
+                yield _report(
+                    number,
+                    f"Import exceeds {MAX_ROWS} rows, remaining rows were skipped.",
+                )
+                break
+            total += 1
+            if error is None:
+                try:
+                    batch.append((number, BulkImportRow.model_validate(record)))
+                except ValidationError as e:
+                    error = _describe(e)
+            if error is not None:
+                failed += 1
+                yield _report(number, error, (record or {}).get("email"))
+            if len(batch) >= BATCH_SIZE:
+                inserted, reports = await _flush(batch)
+                created += inserted
+                failed += len(batch) - inserted
+                for line in reports:
+                    yield line
+                batch = []
+    except ValueError as e:
+        # An unreadable CSV header is only discovered once the body is being read.
+        yield _report(0, str(e))
+    if batch:
+        inserted, reports = await _flush(batch)
+        created += inserted
+        failed += len(batch) - inserted
+        for line in reports:
+            yield line
+    if created:
+        project.user_count.user_counter.invalidate()
+    summary = {"rows": total, "created": created, "failed": failed}
+    yield json.dumps(summary).encode("utf-8") + b"\n"
+
+
+async def BulkImportUsers(
+    chunks: AsyncIterable[bytes], format: str
+) -> AsyncIterator[bytes]:
+    """
+    Creates users from a CSV or NDJSON upload, reading it as it arrives.
+
+    Rows are validated one by one, passwords of a batch are hashed in parallel on the password hashing
+    pool and each batch of BATCH_SIZE rows is inserted with a single ``create_many``. CSV uploads start
+    with a header row naming the ``name``, ``email``, ``password`` and optional ``role`` columns; NDJSON
+    rows are objects with the same keys.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The raw upload, e.g. ``Request.stream()``.
+        format (str): "csv" or "ndjson".
+
+    Returns:
+        AsyncIterator[bytes]: An NDJSON report with one ``{"row", "email", "error"}`` line per row that
+        was not imported, followed by a ``{"rows", "created", "failed"}`` summary line.
+
+    Raises:
+        ValueError: If the format is not supported. This is raised before any output is produced.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported import format {format!r}.")
+    rows = _csv_rows(chunks) if format == "csv" else _ndjson_rows(chunks)
+    return project.ndjson.buffered(_import_lines(rows))
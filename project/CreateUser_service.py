@@ -1,6 +1,7 @@
-import bcrypt
 import prisma
 import prisma.models
+import project.password_hashing
+import project.user_count
 from pydantic import BaseModel
 
 
@@ -24,12 +25,11 @@ async def CreateUser(name: str, email: str, password: str) -> CreateUserResponse
     Returns:
         CreateUserResponse: Response model indicating the successful creation of a user.
     """
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode(
-        "utf-8"
-    )
+    hashed_password = await project.password_hashing.password_hasher.hash(password)
     user = await prisma.models.User.prisma().create(
         data={"username": email, "password": hashed_password}
     )
+    project.user_count.user_counter.invalidate()
     return CreateUserResponse(
         confirmation_message=f"User {name} has been successfully created with ID {user.id}."
     )
@@ -1,5 +1,8 @@
 import prisma
 import prisma.models
+import project.token_verification
+import project.user_cache
+import project.user_count
 from pydantic import BaseModel
 
 
@@ -22,6 +25,9 @@ async def DeleteUser(userId: str) -> DeleteUserResponse:
         DeleteUserResponse: Response model to confirm the deletion of a user. It provides a message stating the outcome of the operation.
     """
     user = await prisma.models.User.prisma().delete(where={"id": userId})
+    project.token_verification.token_verifier.invalidate_user(userId)
+    project.user_count.user_counter.invalidate()
+    await project.user_cache.user_cache.invalidate(userId)
     if user:
         return DeleteUserResponse(
             message=f"User with ID {userId} was successfully deleted."
@@ -0,0 +1,73 @@
+import csv
+import io
+from typing import AsyncIterator
+
+import prisma
+import prisma.models
+import project.ndjson
+import project.pagination
+import project.user_cache
+
+PAGE_SIZE = 1000
+
+FORMATS = ("ndjson", "csv")
+
+COLUMNS = ("id", "username", "role", "createdAt", "updatedAt")
+
+
+async def _users():
+    cursor = None
+    while True:
+        users, cursor, _ = await project.pagination.keyset_page(
+            prisma.models.User.prisma(), PAGE_SIZE, cursor
+        )
+        for user in users:
+            yield project.user_cache.CachedUser(
+                id=user.id,
+                username=user.username,
+                createdAt=user.createdAt,
+                updatedAt=user.updatedAt,
+                role=user.role,
+            )
+        if cursor is None:
+            return
+
+
+async def _ndjson_lines() -> AsyncIterator[bytes]:
+    async for user in _users():
+        yield user.__pydantic_serializer__.to_json(user) + b"\n"
+
+
+async def _csv_lines() -> AsyncIterator[bytes]:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(COLUMNS)
+    async for user in _users():
+        row = user.model_dump(mode="json")
+        writer.writerow([row[column] for column in COLUMNS])
+        if out.tell() >= project.ndjson.CHUNK_SIZE:
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue().encode("utf-8")
+
+
+async def ExportUsers(format: str = "ndjson") -> AsyncIterator[bytes]:
+    """
+    Streams every user, oldest first, as NDJSON or CSV. Users are read in keyset pages of PAGE_SIZE, so
+    memory use does not depend on how many users there are. Password hashes are never exported.
+
+    Args:
+        format (str): "ndjson" for one object per line, "csv" for a header row followed by one row per user.
+
+    Returns:
+        AsyncIterator[bytes]: The encoded chunks.
+
+    Raises:
+        ValueError: If the format is not supported. This is raised before any output is produced.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported export format {format!r}.")
+    if format == "csv":
+        return _csv_lines()
+    return project.ndjson.buffered(_ndjson_lines())
@@ -3,6 +3,7 @@ from datetime import datetime
 import prisma
 import prisma.enums
 import prisma.models
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -29,7 +30,7 @@ async def GetUserDetails(userId: str) -> UserDetailsResponse:
     Returns:
     UserDetailsResponse: Response model encapsulating full user details from the /users/{userId} endpoint.
     """
-    user = await prisma.models.User.prisma().find_unique(where={"id": userId})
+    user = await project.user_cache.user_cache.get_user(userId)
     if user is None:
         raise ValueError(f"prisma.models.User with ID {userId} not found")
     response = UserDetailsResponse(
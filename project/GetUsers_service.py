@@ -2,6 +2,8 @@ from typing import List, Optional
 
 import prisma
 import prisma.models
+import project.pagination
+import project.user_count
 from pydantic import BaseModel
 
 
@@ -21,38 +23,66 @@ class UsersListResponse(BaseModel):
     """
 
     users: List[UserInfo]
-    total: int
-    page: int
+    total: Optional[int]
+    total_exact: Optional[bool] = None
+    page: Optional[int]
     limit: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 async def GetUsers(
-    page: Optional[int] = None, limit: Optional[int] = None
+    page: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    count_mode: Optional[project.user_count.CountMode] = None,
 ) -> UsersListResponse:
     """
     Retrieves a list of all users with pagination support. Each user's ID, username, and email are listed.
 
+    Users are ordered by (createdAt, id) and paged with opaque keyset cursors, so deep pages cost the same as the
+    first one. The legacy ``page`` parameter is still honoured with offset pagination when no cursor is given.
+
     Args:
-        page (Optional[int]): The page number for pagination, starts from 1.
+        page (Optional[int]): The page number for legacy offset pagination, starts from 1.
         limit (Optional[int]): The number of items per page. Default is 10 if not specified.
+        cursor (Optional[str]): The next_cursor or prev_cursor of a previous response.
+        include_total (Optional[bool]): Whether to count all users. Defaults to True unless a cursor is given.
+        count_mode (Optional[project.user_count.CountMode]): How to count the users. Uses the configured default when omitted.
 
     Returns:
         UsersListResponse: This response model returns a paginated list of users including their ID, username, and email.
     """
-    if page is None:
-        page = 1
     if limit is None:
         limit = 10
-    skip = (page - 1) * limit
-    users_query = await prisma.models.User.prisma().find_many(
-        skip=skip, take=limit, order={"createdAt": "asc"}
-    )
+    if include_total is None:
+        include_total = cursor is None
+    if cursor is None and page is not None and page > 1:
+        users_query, next_cursor, prev_cursor = await project.pagination.offset_page(
+            prisma.models.User.prisma(), page, limit
+        )
+    else:
+        users_query, next_cursor, prev_cursor = await project.pagination.keyset_page(
+            prisma.models.User.prisma(), limit, cursor
+        )
+        if cursor is None:
+            page = 1
     users_info = [
-        UserInfo(id=user.id, username=user.username, email=user.email)
+        UserInfo(id=user.id, username=user.username, email=user.username)
         for user in users_query
-    ]  # TODO(autogpt): Cannot access attribute "email" for class "User"
-    #     Attribute "email" is unknown. reportAttributeAccessIssue
-    total_users = await prisma.models.User.prisma().count()
+    ]
+    total_users, total_exact = (
+        await project.user_count.user_counter.count(count_mode)
+        if include_total
+        else (None, None)
+    )
     return UsersListResponse(
-        users=users_info, total=total_users, page=page, limit=limit
+        users=users_info,
+        total=total_users,
+        total_exact=total_exact,
+        page=page if cursor is None else None,
+        limit=limit,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
     )
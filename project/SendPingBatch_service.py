@@ -0,0 +1,71 @@
+import json
+import os
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+
+import project.message_writer
+import project.ndjson
+import project.SendPing_service
+
+MAX_MESSAGES = int(os.environ.get("PING_BATCH_MAX_MESSAGES", "10000"))
+
+
+def _error_line(message: str) -> bytes:
+    return json.dumps({"error": message}).encode("utf-8") + b"\n"
+
+
+async def _as_async(user_messages: Iterable[str]) -> AsyncIterator[str]:
+    for user_message in user_messages:
+        yield user_message
+
+
+async def _pong_lines(
+    user_messages: AsyncIterable[str], user_id: Optional[str]
+) -> AsyncIterator[bytes]:
+    count = 0
+    try:
+        async for user_message in user_messages:
+            count += 1
+            if count > MAX_MESSAGES:
+                yield _error_line(
+                    f"Batch exceeds {MAX_MESSAGES} messages, remaining messages were dropped."
+                )
+                return
+            if not isinstance(user_message, str):
+                yield _error_line(f"Message {count} is not a string.")
+                continue
+            new_message = f"pong: {user_message}"
+            if user_id is not None:
+                await project.message_writer.message_writer.record(
+                    user_message, new_message, user_id
+                )
+            yield json.dumps({"response_message": new_message}).encode("utf-8") + b"\n"
+    except ValueError as e:
+        # Malformed NDJSON is only discovered mid-stream, after the status line was sent.
+        yield _error_line(f"Message {count + 1} could not be decoded: {e}")
+
+
+async def SendPingBatch(
+    user_messages: Union[Iterable[str], AsyncIterable[str]],
+    user_id: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Replies to a batch of user messages with one 'pong: [user_message]' line each, verifying the Security
+    Module once for the whole batch instead of once per message.
+
+    Args:
+        user_messages (Union[Iterable[str], AsyncIterable[str]]): The messages of the batch, consumed lazily.
+        user_id (Optional[str]): The authenticated sender, if any. Their pings are queued for persistence.
+
+    Returns:
+        AsyncIterator[bytes]: NDJSON chunks with one PingResponse object per message, in order. Messages that are
+        not strings, or beyond the batch limit, produce an ``{"error": ...}`` line instead.
+
+    Raises:
+        ValueError: If the security module is not enabled. This is raised before any output is produced.
+    """
+    security_config = await project.SendPing_service.verify_security_module_enabled()
+    if not security_config:
+        raise ValueError("Security module is not enabled.")
+    if not isinstance(user_messages, AsyncIterable):
+        user_messages = _as_async(user_messages)
+    return project.ndjson.buffered(_pong_lines(user_messages, user_id))
@@ -1,5 +1,9 @@
+from typing import Optional
+
 import prisma
 import prisma.models
+import project.message_writer
+import project.module_cache
 from pydantic import BaseModel
 
 
@@ -13,15 +17,21 @@ class PingResponse(BaseModel):
 
 async def verify_security_module_enabled() -> bool:
     """
-    Verifies if the security module is enabled.
+    Verifies if the security module is enabled. The result is served from the in-process module state cache.
 
     Returns:
         bool: True if the security module is enabled, False otherwise.
     """
-    enabled = await prisma.models.Module.prisma().find_first(
-        where={"name": "SECURITY", "enabled": True}
+
+    async def load() -> bool:
+        enabled = await prisma.models.Module.prisma().find_first(
+            where={"name": "SECURITY", "enabled": True}
+        )
+        return enabled is not None
+
+    return await project.module_cache.module_state_cache.get_or_load(
+        ("module", "SECURITY"), load
     )
-    return enabled is not None
 
 
 async def is_authorized_to_ping(user_id: str) -> bool:
@@ -34,19 +44,27 @@ async def is_authorized_to_ping(user_id: str) -> bool:
     Returns:
         bool: True if the user is authorized, False otherwise.
     """
-    authorized = await prisma.models.ModuleRole.prisma().find_first(
-        where={"role": "API_USER", "Module": {"name": "SECURITY", "enabled": True}}
+
+    async def load() -> bool:
+        authorized = await prisma.models.ModuleRole.prisma().find_first(
+            where={"role": "API_USER", "Module": {"name": "SECURITY", "enabled": True}}
+        )
+        return authorized is not None
+
+    return await project.module_cache.module_state_cache.get_or_load(
+        ("module_role", "SECURITY", "API_USER"), load
     )
-    return authorized is not None
 
 
-async def SendPing(user_message: str) -> PingResponse:
+async def SendPing(user_message: str, user_id: Optional[str] = None) -> PingResponse:
     """
     Receives a user message and replies with 'pong: [user_message]'. It ensures the message is authentic by
-    verifying with the Security Module.
+    verifying with the Security Module. Pings from a known user are queued for write-behind persistence
+    in the Message table.
 
     Args:
     user_message (str): The message sent by the user to the server.
+    user_id (Optional[str]): The authenticated sender, if any.
 
     Returns:
     PingResponse: Provides the modified response prefixed with 'pong: ' after the message passes the security checks.
@@ -55,4 +73,8 @@ async def SendPing(user_message: str) -> PingResponse:
     if not security_config:
         raise ValueError("Security module is not enabled.")
     new_message = f"pong: {user_message}"
+    if user_id is not None:
+        await project.message_writer.message_writer.record(
+            user_message, new_message, user_id
+        )
     return PingResponse(response_message=new_message)
@@ -0,0 +1,50 @@
+from typing import AsyncIterator
+
+import prisma
+import prisma.models
+import project.getUserDetails_service
+import project.ndjson
+import project.pagination
+import project.user_cache
+
+PAGE_SIZE = 500
+
+
+async def _message_lines(userId: str) -> AsyncIterator[bytes]:
+    cursor = None
+    while True:
+        user_messages, cursor, _ = await project.pagination.keyset_page(
+            prisma.models.Message.prisma(),
+            PAGE_SIZE,
+            cursor,
+            where={"userId": userId},
+        )
+        for msg in user_messages:
+            yield project.getUserDetails_service.Message(
+                id=msg.id,
+                createdAt=msg.createdAt,
+                content=msg.content,
+                response=msg.response,
+            ).model_dump_json().encode("utf-8") + b"\n"
+        if cursor is None:
+            return
+
+
+async def StreamUserMessages(userId: str) -> AsyncIterator[bytes]:
+    """
+    Streams a user's whole message history, oldest first, as NDJSON. Messages are read in keyset pages of
+    PAGE_SIZE, so memory use does not depend on how many messages the user has sent.
+
+    Args:
+        userId (str): Unique identifier for the user.
+
+    Returns:
+        AsyncIterator[bytes]: NDJSON chunks with one Message object per line.
+
+    Raises:
+        ValueError: If the user does not exist. This is raised before any output is produced.
+    """
+    user = await project.user_cache.user_cache.get_user(userId)
+    if not user:
+        raise ValueError(f"No user found with ID {userId}")
+    return project.ndjson.buffered(_message_lines(userId))
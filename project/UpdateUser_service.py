@@ -4,6 +4,8 @@ from enum import Enum
 import prisma
 import prisma.enums
 import prisma.models
+import project.token_verification
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -51,6 +53,8 @@ async def UpdateUser(
     user = await prisma.models.User.prisma().update(
         where={"id": userId}, data={"username": name, "email": email, "role": str(role)}
     )
+    project.token_verification.token_verifier.invalidate_user(userId)
+    await project.user_cache.user_cache.invalidate(userId)
     updated_user_model = User(
         id=user.id,
         createdAt=user.createdAt,
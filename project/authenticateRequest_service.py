@@ -1,10 +1,16 @@
+import os
 from datetime import datetime, timedelta
 
 import prisma
 import prisma.models
+import project.password_hashing
 from jose import jwt
 from pydantic import BaseModel
 
+SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "YOUR_SECRET_KEY_HERE")
+
+ALGORITHM = "HS256"
+
 
 class AuthenticationResponse(BaseModel):
     """
@@ -29,7 +35,7 @@ def create_access_token(user_id: str, username: str, expiry_period: int = 24) ->
     """
     expiry = datetime.utcnow() + timedelta(hours=expiry_period)
     to_encode = {"exp": expiry, "sub": user_id, "username": username}
-    return jwt.encode(to_encode, "YOUR_SECRET_KEY_HERE", algorithm="HS256")
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
 async def authenticateRequest(username: str, password: str) -> AuthenticationResponse:
@@ -46,7 +52,9 @@ async def authenticateRequest(username: str, password: str) -> AuthenticationRes
     user = await prisma.models.User.prisma().find_unique(where={"username": username})
     if user is None:
         return AuthenticationResponse(token="", message="User not found")
-    if password == "EXPECTED_PASSWORD_PLACEHOLDER":
+    if user.password and await project.password_hashing.password_hasher.verify(
+        password, user.password
+    ):
         token = create_access_token(user_id=user.id, username=user.username)
         return AuthenticationResponse(token=token, message="Authentication successful")
     else:
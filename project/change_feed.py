@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import os
+from typing import Callable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import project.metrics
+import project.module_cache
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "module_state_changed"
+
+TRIGGER_LOCK_ID = 7250314
+
+TRIGGER_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION notify_module_state_changed() RETURNS trigger AS $$
+DECLARE
+    changed jsonb;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := to_jsonb(OLD);
+    ELSE
+        changed := to_jsonb(NEW);
+    END IF;
+    PERFORM pg_notify(
+        '{CHANNEL}',
+        json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'id', changed->>'id',
+            'moduleId', changed->>'moduleId'
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+WATCHED_TABLES = ("Module", "ModuleRole", "Feature")
+
+
+class ModuleStateChange(BaseModel):
+    """
+    A row change on one of the Module, ModuleRole or Feature tables, as published by the NOTIFY triggers.
+    """
+
+    table: str
+    op: str
+    id: Optional[str] = None
+    moduleId: Optional[str] = None
+
+
+Subscriber = Callable[[Optional[ModuleStateChange]], None]
+
+_subscribers: List[Subscriber] = []
+
+_stats = {"connected": False, "events": 0, "resyncs": 0, "reconnects": 0}
+
+project.metrics.register_collector("change_feed", lambda: dict(_stats))
+
+
+def subscribe(subscriber: Subscriber) -> None:
+    """
+    Registers a callback for module state changes.
+
+    The callback receives ``None`` when the listener (re)connects, meaning events may have been
+    missed and all local state derived from those tables must be discarded.
+
+    Args:
+        subscriber (Subscriber): Callback invoked on the event loop for every change.
+    """
+    _subscribers.append(subscriber)
+
+
+def _invalidate_module_state(change: Optional[ModuleStateChange]) -> None:
+    # The cached state is keyed by module name, which the ModuleRole and Feature events do not
+    # carry, and the whole cache is a handful of entries, so every change drops it entirely.
+    project.module_cache.invalidate_module()
+
+
+subscribe(_invalidate_module_state)
+
+
+def _publish(change: Optional[ModuleStateChange]) -> None:
+    for subscriber in _subscribers:
+        try:
+            subscriber(change)
+        except Exception:
+            logger.exception("Module state subscriber failed")
+
+
+def listener_dsn(database_url: str) -> str:
+    """
+    Strips the Prisma-specific query parameters (schema, connection_limit, ...) from a database URL so
+    it can be handed to a plain Postgres driver.
+
+    Args:
+        database_url (str): The DATABASE_URL used by Prisma.
+
+    Returns:
+        str: A libpq-compatible connection string.
+    """
+    parts = urlsplit(database_url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+async def install_triggers(connection) -> None:
+    """
+    Creates (or replaces) the NOTIFY triggers on the watched tables. Concurrent workers are serialised on
+    an advisory lock so they do not race on the DDL.
+
+    Args:
+        connection (asyncpg.Connection): An open connection with DDL privileges.
+    """
+    async with connection.transaction():
+        await connection.execute(f"SELECT pg_advisory_xact_lock({TRIGGER_LOCK_ID})")
+        await connection.execute(TRIGGER_FUNCTION_SQL)
+        for table in WATCHED_TABLES:
+            trigger = f"{table.lower()}_state_changed"
+            await connection.execute(f'DROP TRIGGER IF EXISTS {trigger} ON "{table}"')
+            await connection.execute(
+                f'CREATE TRIGGER {trigger} AFTER INSERT OR UPDATE OR DELETE ON "{table}" '
+                f"FOR EACH ROW EXECUTE FUNCTION notify_module_state_changed()"
+            )
+
+
+def _on_notify(connection, pid: int, channel: str, payload: str) -> None:
+    _stats["events"] += 1
+    try:
+        change = ModuleStateChange.model_validate_json(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed %s payload: %r", channel, payload)
+        change = None
+    _publish(change)
+
+
+async def run_listener(database_url: str, install: bool = True) -> None:
+    """
+    Listens for module state changes until cancelled, reconnecting with exponential back-off.
+
+    While connected, the module state cache is pinned: entries stay valid until a NOTIFY invalidates
+    them, so the ping gate is served from memory without polling. While disconnected the cache falls
+    back to its TTL.
+
+    Args:
+        database_url (str): The DATABASE_URL used by Prisma.
+        install (bool): Whether to (re)install the NOTIFY triggers on connect.
+    """
+    import asyncpg
+
+    backoff = 1.0
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(listener_dsn(database_url))
+            if install:
+                try:
+                    await install_triggers(connection)
+                except asyncpg.PostgresError:
+                    logger.exception("Could not install module state triggers")
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(CHANNEL, _on_notify)
+            project.module_cache.module_state_cache.pinned = True
+            _stats["connected"] = True
+            _stats["resyncs"] += 1
+            _publish(None)
+            backoff = 1.0
+            await closed.wait()
+            logger.warning("Module state listener connection closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Module state listener failed, retrying in %.0fs", backoff)
+        finally:
+            project.module_cache.module_state_cache.pinned = False
+            _stats["connected"] = False
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        _stats["reconnects"] += 1
+        # Anything cached while pinned may have missed an event during the outage.
+        project.module_cache.invalidate_module()
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 30.0)
+
+
+def start_listener() -> Optional[asyncio.Task]:
+    """
+    Starts the background listener if it is enabled and asyncpg is installed.
+
+    Returns:
+        Optional[asyncio.Task]: The listener task, or None when the change feed is disabled.
+    """
+    if os.environ.get("MODULE_CHANGE_FEED", "1") != "1":
+        return None
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        logger.warning("DATABASE_URL is not set, module change feed disabled")
+        return None
+    try:
+        import asyncpg  # noqa: F401
+    except ImportError:
+        logger.info("asyncpg is not installed, module change feed disabled")
+        return None
+    install = os.environ.get("MODULE_CHANGE_FEED_INSTALL_TRIGGERS", "1") == "1"
+    return asyncio.create_task(run_listener(database_url, install))
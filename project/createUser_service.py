@@ -1,7 +1,8 @@
-import bcrypt
 import prisma
 import prisma.enums
 import prisma.models
+import project.password_hashing
+import project.user_count
 from pydantic import BaseModel
 
 
@@ -29,14 +30,15 @@ async def createUser(name: str, email: str, password: str) -> CreateUserResponse
         createUser("John Doe", "john.doe@example.com", "securepassword123")
         > CreateUserResponse(confirmation_message="User John Doe created successfully.")
     """
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hashed_password = await project.password_hashing.password_hasher.hash(password)
     new_user = await prisma.models.User.prisma().create(
         data={
             "username": email,
-            "password": hashed_password.decode("utf-8"),
+            "password": hashed_password,
             "role": prisma.enums.UserRole.API_USER,
         }
     )
+    project.user_count.user_counter.invalidate()
     response = CreateUserResponse(
         confirmation_message=f"User {name} created successfully."
     )
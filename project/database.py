@@ -0,0 +1,131 @@
+import asyncio
+import os
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import project.metrics
+from prisma import Prisma
+
+CONNECTION_LIMIT = int(os.environ.get("DB_CONNECTION_LIMIT", "10"))
+
+POOL_TIMEOUT_SECONDS = float(os.environ.get("DB_POOL_TIMEOUT_SECONDS", "10"))
+
+QUERY_TIMEOUT_SECONDS = float(os.environ.get("DB_QUERY_TIMEOUT_SECONDS", "30"))
+
+CONNECT_TIMEOUT_SECONDS = float(os.environ.get("DB_CONNECT_TIMEOUT_SECONDS", "10"))
+
+READINESS_TIMEOUT_SECONDS = float(os.environ.get("DB_READINESS_TIMEOUT_SECONDS", "1"))
+
+
+def pooled_url(database_url: str) -> str:
+    """
+    Adds the connection pool settings to a database URL, keeping any the URL already sets.
+
+    Args:
+        database_url (str): The DATABASE_URL.
+
+    Returns:
+        str: The URL with ``connection_limit`` and ``pool_timeout`` parameters for the Prisma query engine.
+    """
+    parts = urlsplit(database_url)
+    query = dict(parse_qsl(parts.query))
+    query.setdefault("connection_limit", str(CONNECTION_LIMIT))
+    query.setdefault("pool_timeout", f"{POOL_TIMEOUT_SECONDS:g}")
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def create_client() -> Prisma:
+    """
+    Creates the Prisma client with the pool, query and connect timeouts from the environment.
+
+    Returns:
+        Prisma: The client, registered for ``prisma.models`` access.
+    """
+    database_url = os.environ.get("DATABASE_URL")
+    return Prisma(
+        auto_register=True,
+        datasource={"url": pooled_url(database_url)} if database_url else None,
+        connect_timeout=timedelta(seconds=CONNECT_TIMEOUT_SECONDS),
+        http={"timeout": QUERY_TIMEOUT_SECONDS},
+    )
+
+
+db_client = create_client()
+
+
+def _values(metrics: Any, kind: str) -> Dict[str, Any]:
+    return {metric.key: metric.value for metric in getattr(metrics, kind)}
+
+
+def _histogram(histogram: Any) -> Optional[Dict[str, Any]]:
+    if histogram is None:
+        return None
+    return {
+        "count": histogram.count,
+        "sum_ms": histogram.sum,
+        "buckets": {
+            str(bucket.max_value): bucket.total_count for bucket in histogram.buckets
+        },
+    }
+
+
+async def pool_stats() -> Dict[str, Any]:
+    """
+    Reads connection pool and query metrics from the Prisma query engine.
+
+    Returns:
+        Dict[str, Any]: Open, busy and idle connections, queued queries, and wait time and query duration
+        histograms in milliseconds.
+    """
+    if not db_client.is_connected():
+        return {"connected": False}
+    metrics = await db_client.get_metrics()
+    gauges = _values(metrics, "gauges")
+    counters = _values(metrics, "counters")
+    histograms = _values(metrics, "histograms")
+    return {
+        "connected": True,
+        "connection_limit": CONNECTION_LIMIT,
+        "connections_open": gauges.get("prisma_pool_connections_open", 0),
+        "connections_busy": gauges.get("prisma_pool_connections_busy", 0),
+        "connections_idle": gauges.get("prisma_pool_connections_idle", 0),
+        "queries_active": gauges.get("prisma_client_queries_active", 0),
+        "queries_waiting": gauges.get("prisma_client_queries_wait", 0),
+        "queries_total": counters.get("prisma_client_queries_total", 0),
+        "wait_ms": _histogram(
+            histograms.get("prisma_client_queries_wait_histogram_ms")
+        ),
+        "query_duration_ms": _histogram(
+            histograms.get("prisma_client_queries_duration_histogram_ms")
+        ),
+    }
+
+
+project.metrics.register_collector("database", pool_stats)
+
+
+async def readiness() -> Tuple[bool, str]:
+    """
+    Checks whether the database can take another request right now.
+
+    An exhausted pool (every connection busy and queries already queued) fails immediately rather than
+    waiting for a connection; otherwise a trivial query must answer within READINESS_TIMEOUT_SECONDS.
+
+    Returns:
+        Tuple[bool, str]: Whether the worker is ready, and why not.
+    """
+    if not db_client.is_connected():
+        return False, "Database client is not connected."
+    stats = await pool_stats()
+    if stats["connections_busy"] >= CONNECTION_LIMIT and stats["queries_waiting"] > 0:
+        return False, "Connection pool is exhausted."
+    try:
+        await asyncio.wait_for(
+            db_client.query_raw("SELECT 1"), READINESS_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        return False, "Database did not answer in time."
+    except Exception as e:
+        return False, f"Database check failed: {e}"
+    return True, "ok"
@@ -1,9 +1,12 @@
+import asyncio
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 import prisma
 import prisma.enums
 import prisma.models
+import project.pagination
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -29,20 +32,46 @@ class UserDetailResponse(BaseModel):
     updatedAt: datetime
     role: prisma.enums.UserRole
     Messages: List[Message]
+    messages_next_cursor: Optional[str] = None
+    messages_prev_cursor: Optional[str] = None
 
 
-async def getUserDetails(userId: str) -> UserDetailResponse:
+DEFAULT_MESSAGES_LIMIT = 50
+
+MAX_MESSAGES_LIMIT = 500
+
+
+async def getUserDetails(
+    userId: str,
+    messages_limit: Optional[int] = None,
+    messages_cursor: Optional[str] = None,
+) -> UserDetailResponse:
     """
     Fetches detailed information about a specific user using their unique userID. Useful for detailed user profile views and audit purposes.
 
+    Only one page of the user's messages is included, newest first. Further pages are fetched by passing
+    messages_next_cursor back as messages_cursor.
+
     Args:
         userId (str): Unique identifier for the user. Used to fetch detailed profile data.
+        messages_limit (Optional[int]): The number of messages to include, at most MAX_MESSAGES_LIMIT. Defaults to DEFAULT_MESSAGES_LIMIT.
+        messages_cursor (Optional[str]): A messages cursor from a previous response.
 
     Returns:
         UserDetailResponse: Response model containing detailed information about a user including related data like messages and roles.
     """
-    user = await prisma.models.User.prisma().find_unique(
-        where={"id": userId}, include={"Messages": True}
+    if messages_limit is None:
+        messages_limit = DEFAULT_MESSAGES_LIMIT
+    messages_limit = max(1, min(messages_limit, MAX_MESSAGES_LIMIT))
+    user, (user_messages, next_cursor, prev_cursor) = await asyncio.gather(
+        project.user_cache.user_cache.get_user(userId),
+        project.pagination.keyset_page(
+            prisma.models.Message.prisma(),
+            messages_limit,
+            messages_cursor,
+            where={"userId": userId},
+            order="desc",
+        ),
     )
     if not user:
         raise ValueError(f"No user found with ID {userId}")
@@ -53,7 +82,7 @@ async def getUserDetails(userId: str) -> UserDetailResponse:
             content=msg.content,
             response=msg.response,
         )
-        for msg in user.Messages
+        for msg in user_messages
     ]
     details = UserDetailResponse(
         id=user.id,
@@ -62,5 +91,7 @@ async def getUserDetails(userId: str) -> UserDetailResponse:
         updatedAt=user.updatedAt,
         role=user.role.name,
         Messages=messages,
+        messages_next_cursor=next_cursor,
+        messages_prev_cursor=prev_cursor,
     )
     return details
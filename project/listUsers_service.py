@@ -4,6 +4,7 @@ from typing import List, Optional
 import prisma
 import prisma.enums
 import prisma.models
+import project.pagination
 from pydantic import BaseModel
 
 
@@ -25,26 +26,40 @@ class GetUsersResponse(BaseModel):
     """
 
     users: List[User]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 async def listUsers(
-    page: Optional[int] = None, limit: Optional[int] = None
+    page: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> GetUsersResponse:
     """
     Retrieves a list of all users in the system. Accessible by administrators for monitoring and management purposes.
 
+    Users are ordered by (createdAt, id) and paged with opaque keyset cursors. The legacy ``page`` parameter is
+    still honoured with offset pagination when no cursor is given.
+
     Args:
-        page (Optional[int]): The page number for pagination. Starts from 1.
+        page (Optional[int]): The page number for legacy offset pagination. Starts from 1.
         limit (Optional[int]): The number of items per page. Default is set to a reasonable number like 10.
+        cursor (Optional[str]): The next_cursor or prev_cursor of a previous response.
 
     Returns:
         GetUsersResponse: Response model returning the list of all users, wrapped in a standard response structure.
     """
     if limit is None:
         limit = 10
-    if page is None:
-        page = 1
-    skip = (page - 1) * limit
-    users = await prisma.models.User.prisma().find_many(skip=skip, take=limit)
-    response = GetUsersResponse(users=users)
+    if cursor is None and page is not None and page > 1:
+        users, next_cursor, prev_cursor = await project.pagination.offset_page(
+            prisma.models.User.prisma(), page, limit
+        )
+    else:
+        users, next_cursor, prev_cursor = await project.pagination.keyset_page(
+            prisma.models.User.prisma(), limit, cursor
+        )
+    response = GetUsersResponse(
+        users=users, next_cursor=next_cursor, prev_cursor=prev_cursor
+    )
     return response
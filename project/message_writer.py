@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import prisma
+import prisma.models
+import project.metrics
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MessageWriter:
+    """
+    Write-behind persistence of pings into the Message table.
+
+    Pings are put on a bounded queue and a background task inserts them with ``create_many``
+    once ``batch_size`` rows are pending or ``flush_interval`` seconds have passed since the
+    first one, whichever comes first. When the queue is full, the ``drop`` policy discards the
+    row while ``block`` makes the caller wait for room.
+    """
+
+    def __init__(
+        self, max_queue: int, batch_size: int, flush_interval: float, policy: str
+    ) -> None:
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown queue full policy {policy!r}.")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flush_seconds = project.metrics.Histogram()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+
+    async def record(self, content: str, response: str, user_id: str) -> bool:
+        """
+        Queues a ping for persistence.
+
+        Args:
+            content (str): The message the user sent.
+            response (str): The reply the server sent back.
+            user_id (str): The sender's unique identifier.
+
+        Returns:
+            bool: False if the writer is not running or the row was dropped because the queue is full.
+        """
+        if self._task is None:
+            return False
+        row = {"content": content, "response": response, "userId": user_id}
+        if self.policy == "block":
+            await self._queue.put(row)
+        else:
+            try:
+                self._queue.put_nowait(row)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return False
+        self.enqueued += 1
+        return True
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            await prisma.models.Message.prisma().create_many(data=batch)
+            self.written += len(batch)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Failed to persist %d messages", len(batch))
+        self.flush_seconds.observe(time.perf_counter() - started)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if self._queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    def start(self) -> None:
+        """
+        Starts the background flush task.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stops accepting pings and flushes everything already queued.
+
+        Args:
+            timeout (float): Seconds to wait for the drain before giving up on the remaining rows.
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.put(_STOP), timeout)
+            await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            task.cancel()
+            logger.warning(
+                "Gave up draining the message queue, %d messages were not persisted",
+                self._queue.qsize(),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the queue and flush counters.
+
+        Returns:
+            Dict[str, Any]: Queue depth, row counts by outcome and the flush latency histogram.
+        """
+        return {
+            "running": self._task is not None,
+            "policy": self.policy,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "flush_seconds": self.flush_seconds.snapshot(),
+        }
+
+
+message_writer = MessageWriter(
+    max_queue=int(os.environ.get("MESSAGE_QUEUE_MAX", "10000")),
+    batch_size=int(os.environ.get("MESSAGE_FLUSH_SIZE", "500")),
+    flush_interval=float(os.environ.get("MESSAGE_FLUSH_INTERVAL_SECONDS", "0.5")),
+    policy=os.environ.get("MESSAGE_QUEUE_FULL_POLICY", "drop"),
+)
+
+project.metrics.register_collector("message_writer", message_writer.stats)
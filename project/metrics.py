@@ -0,0 +1,116 @@
+import inspect
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, Sequence, Union
+
+Collector = Callable[[], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]]
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_collectors: Dict[str, Collector] = {}
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of durations in seconds, cheap enough to update on every request.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Records one observation.
+
+        Args:
+            value (float): The observed duration in seconds.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile as the upper bound of the bucket it falls into.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated value, or 0.0 when nothing was observed. Observations above the last bucket report the last bound.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Reports the histogram state.
+
+        Returns:
+            Dict[str, Any]: Count, sum, estimated p50/p95/p99 and the per-bucket counts.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                **{
+                    str(bound): count for bound, count in zip(self.buckets, self.counts)
+                },
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+def register_collector(name: str, collector: Collector) -> None:
+    """
+    Registers a callable that reports the current state of a subsystem on the /metrics endpoint.
+
+    Args:
+        name (str): The section name the collector's output is published under.
+        collector (Collector): A zero-argument callable or coroutine function returning a
+            JSON-serialisable dict.
+    """
+    _collectors[name] = collector
+
+
+async def collect() -> Dict[str, Any]:
+    """
+    Gathers a snapshot from every registered collector.
+
+    Returns:
+        Dict[str, Any]: The collector outputs keyed by section name.
+    """
+    snapshot = {}
+    for name, collector in _collectors.items():
+        value = collector()
+        if inspect.isawaitable(value):
+            value = await value
+        snapshot[name] = value
+    return snapshot
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import project.metrics
+
+
+class TTLCache:
+    """
+    In-process cache with per-entry expiry and single-flight loading.
+
+    Concurrent misses for the same key share one call to the loader, so an expired entry
+    never causes a stampede of identical database queries. While ``pinned`` is set, entries
+    never expire and are only dropped by explicit invalidation.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.pinned = False
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Returns the cached value for a key, calling the loader once if it is missing or expired.
+
+        Args:
+            key (Hashable): The cache key.
+            loader (Callable[[], Awaitable[Any]]): Coroutine factory producing the fresh value.
+
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and (self.pinned or entry[0] > time.monotonic()):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it.
+            future.exception()
+            raise
+        else:
+            # An invalidation that arrived while loading means the value may already be stale.
+            if (self.ttl > 0 or self.pinned) and generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    @property
+    def generation(self) -> int:
+        """
+        A counter bumped by every invalidation, so holders of a value read from the cache can tell
+        whether it may have changed since.
+        """
+        return self._generation
+
+    def invalidate(
+        self, predicate: Optional[Callable[[Hashable], bool]] = None
+    ) -> None:
+        """
+        Drops cached entries so the next lookup goes back to the database.
+
+        Args:
+            predicate (Optional[Callable[[Hashable], bool]]): Selects the keys to drop. All keys are dropped when omitted.
+        """
+        self._generation += 1
+        self.invalidations += 1
+        if predicate is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the cache counters.
+
+        Returns:
+            Dict[str, Any]: Hit, miss and invalidation counts along with the current size and TTL.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl,
+            "pinned": self.pinned,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+module_state_cache = TTLCache(
+    ttl=float(os.environ.get("MODULE_CACHE_TTL_SECONDS", "5"))
+)
+
+project.metrics.register_collector("module_cache", module_state_cache.stats)
+
+
+def invalidate_module(name: Optional[str] = None) -> None:
+    """
+    Invalidates the cached enablement state of a module and its roles. Call this whenever a module is toggled.
+
+    Args:
+        name (Optional[str]): The module name, e.g. "SECURITY". Every module is invalidated when omitted.
+    """
+    if name is None:
+        module_state_cache.invalidate()
+    else:
+        module_state_cache.invalidate(lambda key: key[1] == name)
@@ -0,0 +1,66 @@
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Splits a byte stream such as ``Request.stream()`` into lines, without their line endings.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The raw body chunks, split at arbitrary positions.
+
+    Yields:
+        bytes: Each line, including blank ones, so callers can number them.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending:
+        yield pending.rstrip(b"\r")
+
+
+async def iter_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """
+    Incrementally decodes newline-delimited JSON from a byte stream such as ``Request.stream()``.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The raw body chunks, split at arbitrary positions.
+
+    Yields:
+        Any: One decoded JSON value per non-blank line.
+
+    Raises:
+        ValueError: If a line is not valid JSON.
+    """
+    async for line in iter_lines(chunks):
+        if line.strip():
+            yield json.loads(line)
+
+
+async def buffered(
+    lines: AsyncIterable[bytes], size: int = CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Coalesces small encoded lines into chunks of roughly ``size`` bytes so a streamed body is not
+    written one tiny frame per record.
+
+    Args:
+        lines (AsyncIterable[bytes]): Encoded lines, each ending in a newline.
+        size (int): The chunk size to flush at.
+
+    Yields:
+        bytes: The coalesced chunks.
+    """
+    buffer = bytearray()
+    async for line in lines:
+        buffer += line
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
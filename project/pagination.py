@@ -0,0 +1,148 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Cursor(NamedTuple):
+    """
+    A decoded keyset cursor: the (createdAt, id) of a boundary row and which way to page from it.
+    """
+
+    created_at: datetime
+    id: str
+    direction: str
+
+
+def encode_cursor(row: Any, direction: str) -> str:
+    """
+    Builds an opaque cursor pointing at a row.
+
+    Args:
+        row (Any): A Prisma record with ``createdAt`` and ``id`` fields.
+        direction (str): "next" to page past the row, "prev" to page before it.
+
+    Returns:
+        str: The URL-safe cursor.
+    """
+    raw = json.dumps([direction, row.createdAt.isoformat(), row.id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Parses a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The opaque cursor.
+
+    Returns:
+        Cursor: The decoded cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return Cursor(datetime.fromisoformat(created_at), str(row_id), direction)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor {cursor!r}.") from e
+
+
+def _after(cursor: Cursor, op: str) -> Dict[str, Any]:
+    return {
+        "OR": [
+            {"createdAt": {op: cursor.created_at}},
+            {"createdAt": {"equals": cursor.created_at}, "id": {op: cursor.id}},
+        ]
+    }
+
+
+async def keyset_page(
+    actions: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    where: Optional[Dict[str, Any]] = None,
+    order: str = "asc",
+    **kwargs: Any,
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """
+    Fetches one page ordered by (createdAt, id) using keyset pagination, so the cost of a page does not
+    depend on how deep it is.
+
+    Args:
+        actions (Any): The Prisma model actions, e.g. ``prisma.models.User.prisma()``.
+        limit (int): The page size.
+        cursor (Optional[str]): A cursor from a previous page, or None for the first page.
+        where (Optional[Dict[str, Any]]): Additional filter applied to every page.
+        order (str): "asc" for oldest first, "desc" for newest first.
+        **kwargs (Any): Passed through to ``find_many``, e.g. ``include``.
+
+    Returns:
+        Tuple[List[Any], Optional[str], Optional[str]]: The rows, the next cursor and the previous cursor. A cursor
+        is None when there is nothing further in that direction.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    forward_op, backward_op = ("gt", "lt") if order == "asc" else ("lt", "gt")
+    reverse = "desc" if order == "asc" else "asc"
+    decoded = decode_cursor(cursor) if cursor else None
+    backwards = decoded is not None and decoded.direction == "prev"
+    filters = [where] if where else []
+    if decoded is not None:
+        filters.append(_after(decoded, backward_op if backwards else forward_op))
+    direction = reverse if backwards else order
+    rows = await actions.find_many(
+        where={"AND": filters} if filters else None,
+        order=[{"createdAt": direction}, {"id": direction}],
+        take=limit + 1,
+        **kwargs,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+    if backwards:
+        next_cursor = encode_cursor(rows[-1], "next")
+        prev_cursor = encode_cursor(rows[0], "prev") if has_more else None
+    else:
+        next_cursor = encode_cursor(rows[-1], "next") if has_more else None
+        prev_cursor = encode_cursor(rows[0], "prev") if decoded is not None else None
+    return rows, next_cursor, prev_cursor
+
+
+async def offset_page(
+    actions: Any, page: int, limit: int, **kwargs: Any
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """
+    Compatibility shim for the legacy ``page`` parameter: fetches a page with an offset in the same
+    (createdAt, id) order as keyset_page, and returns cursors so callers can switch to keyset paging.
+
+    Args:
+        actions (Any): The Prisma model actions, e.g. ``prisma.models.User.prisma()``.
+        page (int): The page number, starting from 1.
+        limit (int): The page size.
+        **kwargs (Any): Passed through to ``find_many``, e.g. ``include``.
+
+    Returns:
+        Tuple[List[Any], Optional[str], Optional[str]]: The rows, the next cursor and the previous cursor.
+    """
+    rows = await actions.find_many(
+        skip=(page - 1) * limit,
+        take=limit + 1,
+        order=[{"createdAt": "asc"}, {"id": "asc"}],
+        **kwargs,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return rows, None, None
+    next_cursor = encode_cursor(rows[-1], "next") if has_more else None
+    prev_cursor = encode_cursor(rows[0], "prev") if page > 1 else None
+    return rows, next_cursor, prev_cursor
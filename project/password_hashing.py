@@ -0,0 +1,130 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import bcrypt
+import project.metrics
+
+T = TypeVar("T")
+
+
+class HashingPoolSaturatedError(Exception):
+    """
+    Raised when the password hashing pool already has its maximum number of pending jobs.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so hashing never blocks the event loop.
+
+    bcrypt releases the GIL while it works, so threads give real parallelism here. Jobs beyond
+    ``max_pending`` (running plus queued) are rejected instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self.wait_seconds = project.metrics.Histogram()
+        self.hash_seconds = project.metrics.Histogram()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingPoolSaturatedError("Password hashing pool is saturated.")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+        submitted = time.perf_counter()
+
+        def timed() -> Tuple[float, float, T]:
+            started = time.perf_counter()
+            result = fn(*args)
+            return started - submitted, time.perf_counter() - started, result
+
+        self.pending += 1
+        try:
+            waited, took, result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, timed
+            )
+        finally:
+            self.pending -= 1
+        self.wait_seconds.observe(waited)
+        self.hash_seconds.observe(took)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """
+        Hashes a password with a fresh salt.
+
+        Args:
+            password (str): The plain-text password.
+
+        Returns:
+            str: The bcrypt hash.
+
+        Raises:
+            HashingPoolSaturatedError: If too many hashing jobs are already pending.
+        """
+        hashed = await self._run(
+            bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt()
+        )
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """
+        Checks a password against a stored bcrypt hash.
+
+        Args:
+            password (str): The plain-text password.
+            hashed (str): The stored bcrypt hash.
+
+        Returns:
+            bool: True if the password matches.
+
+        Raises:
+            HashingPoolSaturatedError: If too many hashing jobs are already pending.
+        """
+        return await self._run(
+            bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8")
+        )
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker threads once the queued jobs have finished.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the pool occupancy and timing histograms.
+
+        Returns:
+            Dict[str, Any]: Pending and rejected job counts with queue wait and hash time histograms.
+        """
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "wait_seconds": self.wait_seconds.snapshot(),
+            "hash_seconds": self.hash_seconds.snapshot(),
+        }
+
+
+_workers = int(os.environ.get("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+
+password_hasher = PasswordHasher(
+    workers=_workers,
+    max_pending=int(os.environ.get("PASSWORD_HASH_MAX_PENDING", _workers * 8)),
+)
+
+project.metrics.register_collector("password_hashing", password_hasher.stats)
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+import project.message_writer
+import project.metrics
+import project.module_cache
+import project.rate_limiting
+import project.SendPing_service
+import project.token_verification
+from fastapi import WebSocket
+
+# Close codes from RFC 6455 and the IANA registry.
+POLICY_VIOLATION = 1008
+UNSUPPORTED_DATA = 1003
+TRY_AGAIN_LATER = 1013
+
+
+class SecurityGate:
+    """
+    The SECURITY module check of one connection.
+
+    The module state is read once and only read again after the module state cache was invalidated,
+    or, when the cache is not kept fresh by the change feed, after its TTL has passed.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._generation: Optional[int] = None
+        self._expires = 0.0
+
+    async def allowed(self) -> bool:
+        cache = project.module_cache.module_state_cache
+        now = time.monotonic()
+        if self._generation != cache.generation or (
+            not cache.pinned and now >= self._expires
+        ):
+            generation = cache.generation
+            self.enabled = (
+                await project.SendPing_service.verify_security_module_enabled()
+            )
+            self._generation = generation
+            self._expires = now + cache.ttl
+        return self.enabled
+
+
+class PingSocketServer:
+    """
+    Serves the ``/ping/ws`` channel: one authenticated connection carrying any number of pings.
+
+    Each text frame is answered with a ``pong: <message>`` text frame, in order. Frames are handled
+    one at a time, so a client that stops reading stalls its own connection rather than buffering
+    replies without bound: once a reply has waited ``send_timeout`` seconds to be written, the
+    connection is dropped. At most ``max_connections`` connections are served per worker.
+    """
+
+    def __init__(self, max_connections: int, send_timeout: float) -> None:
+        self.max_connections = max_connections
+        self.send_timeout = send_timeout
+        self.connections = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.messages = 0
+        self.slow_consumers = 0
+
+    async def serve(self, websocket: WebSocket, token: Optional[str]) -> None:
+        """
+        Authenticates a connection and answers its pings until it closes.
+
+        Args:
+            websocket (WebSocket): The connection, not yet accepted.
+            token (Optional[str]): An access token from authenticateRequest.
+        """
+        if self.connections >= self.max_connections:
+            self.rejected += 1
+            await websocket.close(TRY_AGAIN_LATER, "Too many connections.")
+            return
+        self.connections += 1
+        try:
+            await self._serve(websocket, token)
+        finally:
+            self.connections -= 1
+
+    async def _serve(self, websocket: WebSocket, token: Optional[str]) -> None:
+        try:
+            user = await project.token_verification.token_verifier.verify(token or "")
+            project.rate_limiting.check_rate_limit(f"user:{user.id}", user.role)
+        except (
+            project.token_verification.InvalidTokenError,
+            project.rate_limiting.RateLimitExceededError,
+        ) as e:
+            self.rejected += 1
+            await websocket.close(POLICY_VIOLATION, str(e))
+            return
+        gate = SecurityGate()
+        if not await gate.allowed():
+            self.rejected += 1
+            await websocket.close(POLICY_VIOLATION, "Security module is not enabled.")
+            return
+        await websocket.accept()
+        self.accepted += 1
+        writer = project.message_writer.message_writer
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            user_message = message.get("text")
+            if user_message is None:
+                await websocket.close(UNSUPPORTED_DATA, "Expected text frames.")
+                return
+            if not await gate.allowed():
+                await websocket.close(
+                    POLICY_VIOLATION, "Security module is not enabled."
+                )
+                return
+            response = f"pong: {user_message}"
+            await writer.record(user_message, response, user.id)
+            try:
+                await asyncio.wait_for(
+                    websocket.send({"type": "websocket.send", "text": response}),
+                    self.send_timeout,
+                )
+            except asyncio.TimeoutError:
+                # The client is not reading its replies; returning drops the connection.
+                self.slow_consumers += 1
+                return
+            self.messages += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the channel counters.
+
+        Returns:
+            Dict[str, Any]: Open connections, accepted and rejected connection counts, pings answered
+            and connections dropped for not reading.
+        """
+        return {
+            "connections": self.connections,
+            "max_connections": self.max_connections,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "messages": self.messages,
+            "slow_consumers": self.slow_consumers,
+        }
+
+
+ping_socket_server = PingSocketServer(
+    max_connections=int(os.environ.get("PING_WS_MAX_CONNECTIONS", "1000")),
+    send_timeout=float(os.environ.get("PING_WS_SEND_TIMEOUT_SECONDS", "10")),
+)
+
+project.metrics.register_collector("ping_socket", ping_socket_server.stats)
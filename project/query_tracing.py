@@ -0,0 +1,270 @@
+import contextvars
+import logging
+import os
+import random
+import secrets
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import project.metrics
+import project.responses
+
+logger = logging.getLogger(__name__)
+
+# (ASGI scope, trace id, parent span id) of the request being served, set by QueryTracingMiddleware.
+_request: contextvars.ContextVar[Optional[Tuple[Dict[str, Any], str, str]]] = (
+    contextvars.ContextVar("query_tracing_request", default=None)
+)
+
+
+def _endpoint(scope: Optional[Dict[str, Any]]) -> str:
+    if scope is None:
+        return "background"
+    # The router stores the matched route in the scope once routing is done, which is always before
+    # the handler issues its first query.
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', scope['type'].upper())} {path}"
+
+
+class SpanExporter:
+    """
+    Writes finished spans as OTLP/JSON lines, the format read by the OpenTelemetry Collector's
+    ``otlpjsonfile`` receiver. Spans are buffered and written ``batch_size`` at a time, one
+    ``ExportTraceServiceRequest`` per line.
+    """
+
+    def __init__(self, path: str, batch_size: int, service_name: str) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.service_name = service_name
+        self.exported = 0
+        self._spans: List[Tuple[Any, ...]] = []
+
+    def add(self, span: Tuple[Any, ...]) -> None:
+        """
+        Buffers a finished span. The OTLP document is only built when the batch is written.
+
+        Args:
+            span (Tuple[Any, ...]): The arguments of _span.
+        """
+        self._spans.append(span)
+        if len(self._spans) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes out every buffered span.
+        """
+        spans, self._spans = self._spans, []
+        if not spans:
+            return
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "project.query_tracing"},
+                            "spans": [_span(*span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        try:
+            with open(self.path, "ab") as f:
+                f.write(project.responses.dumps(request) + b"\n")
+            self.exported += len(spans)
+        except OSError:
+            logger.exception("Failed to export %d spans to %s", len(spans), self.path)
+
+
+def _span(
+    name: str,
+    trace_id: str,
+    parent_id: str,
+    started_ns: int,
+    ended_ns: int,
+    endpoint: str,
+    error: Optional[str],
+) -> Dict[str, Any]:
+    return {
+        "traceId": trace_id,
+        "spanId": f"{random.getrandbits(64):016x}",
+        "parentSpanId": parent_id,
+        "name": name,
+        "kind": 3,
+        "startTimeUnixNano": str(started_ns),
+        "endTimeUnixNano": str(ended_ns),
+        "attributes": [
+            {"key": "db.system", "value": {"stringValue": "postgresql"}},
+            {"key": "db.operation", "value": {"stringValue": name}},
+            {"key": "http.route", "value": {"stringValue": endpoint}},
+        ],
+        "status": {"code": 2, "message": error} if error is not None else {"code": 1},
+    }
+
+
+class QueryTracer:
+    """
+    Times every query the Prisma client sends to the query engine.
+
+    Model calls such as ``User.find_many`` and raw queries all go through ``Prisma._execute``, so
+    wrapping that one method covers every service module. Each call is tagged with the operation
+    (``<Model>.<method>``) and the endpoint serving it, aggregated into a histogram per pair, and
+    optionally exported as a span. Nothing is patched unless instrument is called.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None) -> None:
+        self.exporter = exporter
+        self.errors = 0
+        self._histograms: Dict[Tuple[str, str], project.metrics.Histogram] = {}
+        self._original: Any = None
+        self._client_cls: Any = None
+
+    def observe(self, operation: str, endpoint: str, seconds: float) -> None:
+        """
+        Records the duration of one query.
+
+        Args:
+            operation (str): The operation, e.g. ``User.find_many``.
+            endpoint (str): The endpoint the query ran for, e.g. ``GET /v2/users``.
+            seconds (float): How long the query took.
+        """
+        histogram = self._histograms.get((operation, endpoint))
+        if histogram is None:
+            histogram = self._histograms[(operation, endpoint)] = (
+                project.metrics.Histogram()
+            )
+        histogram.observe(seconds)
+
+    def instrument(self, client_cls: Any) -> None:
+        """
+        Wraps ``_execute`` on a Prisma client class. Patching the class also covers the clients
+        created for interactive transactions.
+
+        Args:
+            client_cls (Any): The client class, normally ``prisma.Prisma``.
+        """
+        if self._original is not None:
+            return
+        original = self._original = client_cls._execute
+        tracer = self
+
+        async def _execute(self, *, method, arguments, model=None, root_selection=None):
+            request = _request.get()
+            started = time.perf_counter_ns()
+            error = None
+            try:
+                return await original(
+                    self,
+                    method=method,
+                    arguments=arguments,
+                    model=model,
+                    root_selection=root_selection,
+                )
+            except BaseException as e:
+                error = e
+                tracer.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter_ns() - started
+                operation = f"{model.__name__ if model is not None else 'raw'}.{method}"
+                endpoint = _endpoint(request[0] if request is not None else None)
+                tracer.observe(operation, endpoint, elapsed / 1e9)
+                if tracer.exporter is not None and request is not None:
+                    ended = time.time_ns()
+                    tracer.exporter.add(
+                        (
+                            operation,
+                            request[1],
+                            request[2],
+                            ended - elapsed,
+                            ended,
+                            endpoint,
+                            str(error) if error is not None else None,
+                        )
+                    )
+
+        client_cls._execute = _execute
+        self._client_cls = client_cls
+
+    def uninstrument(self) -> None:
+        """
+        Restores the client class's original ``_execute``.
+        """
+        if self._original is not None:
+            self._client_cls._execute = self._original
+            self._original = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the query latency histograms.
+
+        Returns:
+            Dict[str, Any]: Histogram snapshots keyed by operation, then by endpoint.
+        """
+        operations: Dict[str, Dict[str, Any]] = {}
+        for (operation, endpoint), histogram in sorted(self._histograms.items()):
+            operations.setdefault(operation, {})[endpoint] = histogram.snapshot()
+        return {
+            "enabled": self._original is not None,
+            "errors": self.errors,
+            "exported_spans": self.exporter.exported if self.exporter else 0,
+            "operations": operations,
+        }
+
+
+def _parent(scope: Dict[str, Any]) -> Tuple[str, str]:
+    # Continue the caller's trace when it sent a W3C traceparent header.
+    for name, value in scope.get("headers", ()):
+        if name == b"traceparent":
+            parts = value.decode("latin-1").split("-")
+            if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+                return parts[1], parts[2]
+    return secrets.token_hex(16), secrets.token_hex(8)
+
+
+class QueryTracingMiddleware:
+    """
+    ASGI middleware recording which request a query runs for, so it can be tagged with the endpoint.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = _request.set((scope, *_parent(scope)))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request.reset(token)
+
+
+def _create_exporter() -> Optional[SpanExporter]:
+    path = os.environ.get("QUERY_TRACING_SPANS_FILE", "")
+    if not path:
+        return None
+    return SpanExporter(
+        path,
+        batch_size=int(os.environ.get("QUERY_TRACING_SPANS_BATCH", "256")),
+        service_name=os.environ.get("QUERY_TRACING_SERVICE_NAME", "ping"),
+    )
+
+
+ENABLED = os.environ.get("QUERY_TRACING", "0") == "1"
+
+query_tracer = QueryTracer(exporter=_create_exporter() if ENABLED else None)
+
+project.metrics.register_collector("query_tracing", query_tracer.stats)
@@ -0,0 +1,300 @@
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import prisma
+import prisma.enums
+import project.metrics
+import project.responses
+import project.token_verification
+from fastapi import Depends, Request
+
+
+class RateLimitExceededError(Exception):
+    """
+    Raised when a caller has used up its request quota. ``headers`` carries the Retry-After value.
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Rate limit exceeded.")
+        self.headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
+
+
+def parse_quota(value: str) -> Tuple[float, float]:
+    """
+    Parses a ``<requests per second>:<burst>`` quota.
+
+    Args:
+        value (str): The quota, e.g. "10:20".
+
+    Returns:
+        Tuple[float, float]: The refill rate and the bucket capacity.
+
+    Raises:
+        ValueError: If the quota is malformed.
+    """
+    try:
+        rate, burst = (float(part) for part in value.split(":"))
+    except ValueError as e:
+        raise ValueError(f"Invalid rate limit quota {value!r}.") from e
+    if rate <= 0 or burst < 1:
+        raise ValueError(f"Invalid rate limit quota {value!r}.")
+    return rate, burst
+
+
+class TokenBucketLimiter:
+    """
+    Token-bucket rate limiter keyed by caller.
+
+    Each key gets a bucket of ``burst`` tokens refilled at ``rate`` tokens per second; a request takes
+    one token. Buckets are refilled lazily when their key is seen, so a check is O(1). At most
+    ``max_keys`` buckets are kept, least recently used first out; an evicted caller simply starts again
+    with a full bucket.
+    """
+
+    def __init__(self, quotas: Dict[str, Tuple[float, float]], max_keys: int) -> None:
+        self.quotas = quotas
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def acquire(self, key: str, quota: str) -> float:
+        """
+        Takes a token from a caller's bucket.
+
+        Args:
+            key (str): The caller, e.g. ``user:<id>`` or ``ip:<address>``.
+            quota (str): The name of the quota the caller is subject to.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds until a token is available.
+        """
+        rate, burst = self.quotas[quota]
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            self.allowed += 1
+            return 0.0
+        self.limited += 1
+        return (1 - bucket[0]) / rate
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the limiter counters.
+
+        Returns:
+            Dict[str, Any]: Tracked keys, allowed, limited and evicted counts, and the quotas.
+        """
+        return {
+            "keys": len(self._buckets),
+            "max_keys": self.max_keys,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+            "quotas": {
+                name: {"rate": rate, "burst": burst}
+                for name, (rate, burst) in self.quotas.items()
+            },
+        }
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of requests a worker serves at once.
+
+    Requests beyond ``max_in_flight`` wait for a slot, at most ``max_waiting`` of them and for no
+    longer than ``queue_timeout`` seconds; the rest are shed straight away. Rejecting early keeps the
+    latency of admitted requests bounded instead of letting every request slow down together.
+    """
+
+    def __init__(
+        self, max_in_flight: int, max_waiting: int, queue_timeout: float
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_waiting = max_waiting
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed = 0
+        self.wait_seconds = project.metrics.Histogram()
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    async def acquire(self) -> bool:
+        """
+        Waits for a slot.
+
+        Returns:
+            bool: False if the request should be shed.
+        """
+        if not self._slots.locked():
+            await self._slots.acquire()
+        else:
+            if self.waiting >= self.max_waiting:
+                self.shed += 1
+                return False
+            started = time.perf_counter()
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.shed += 1
+                return False
+            finally:
+                self.waiting -= 1
+            self.wait_seconds.observe(time.perf_counter() - started)
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        """
+        Frees the slot taken by acquire.
+        """
+        self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the admission counters.
+
+        Returns:
+            Dict[str, Any]: Current occupancy, admitted and shed counts and the queue wait histogram.
+        """
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_waiting": self.max_waiting,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware passing HTTP requests through a ConcurrencyLimiter and answering 503 with
+    Retry-After when one is shed. Health checks and metrics are never shed.
+    """
+
+    exempt_prefixes = ("/health/", "/metrics")
+
+    def __init__(self, app: Any, limiter: ConcurrencyLimiter) -> None:
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+        if not await self.limiter.acquire():
+            response = project.responses.error_response(
+                "Server is overloaded.", 503, {"Retry-After": "1"}
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
+
+
+def _quotas() -> Dict[str, Tuple[float, float]]:
+    defaults = {
+        prisma.enums.UserRole.API_USER.value: "20:40",
+        prisma.enums.UserRole.SYSTEM_ADMIN.value: "200:400",
+        "ANONYMOUS": "20:40",
+    }
+    return {
+        name: parse_quota(os.environ.get(f"RATE_LIMIT_{name}", default))
+        for name, default in defaults.items()
+    }
+
+
+rate_limiter = TokenBucketLimiter(
+    quotas=_quotas(),
+    max_keys=int(os.environ.get("RATE_LIMIT_MAX_KEYS", "100000")),
+)
+
+project.metrics.register_collector("rate_limiting", rate_limiter.stats)
+
+ADMISSION_MAX_IN_FLIGHT = int(os.environ.get("ADMISSION_MAX_IN_FLIGHT", "256"))
+
+admission_limiter: Optional[ConcurrencyLimiter] = None
+if ADMISSION_MAX_IN_FLIGHT > 0:
+    admission_limiter = ConcurrencyLimiter(
+        max_in_flight=ADMISSION_MAX_IN_FLIGHT,
+        max_waiting=int(os.environ.get("ADMISSION_MAX_WAITING", "512")),
+        queue_timeout=float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_SECONDS", "1")),
+    )
+    project.metrics.register_collector("admission_control", admission_limiter.stats)
+
+
+def client_key(request: Request) -> str:
+    """
+    Identifies an unauthenticated caller by address. Behind a proxy, run uvicorn with
+    ``--proxy-headers`` so this is the client's address rather than the proxy's.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        str: The rate limit key.
+    """
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def check_rate_limit(key: str, role: Optional[prisma.enums.UserRole] = None) -> None:
+    """
+    Takes a token for a caller.
+
+    Args:
+        key (str): The caller's rate limit key.
+        role (Optional[prisma.enums.UserRole]): The caller's role, or None if not authenticated.
+
+    Raises:
+        RateLimitExceededError: If the caller's bucket is empty.
+    """
+    retry_after = rate_limiter.acquire(key, role.value if role else "ANONYMOUS")
+    if retry_after:
+        raise RateLimitExceededError(retry_after)
+
+
+async def limit_by_user(
+    user: project.token_verification.AuthenticatedUser = Depends(
+        project.token_verification.require_access_token
+    ),
+) -> None:
+    """
+    FastAPI dependency applying the caller's role quota, keyed by the authenticated user.
+
+    Raises:
+        RateLimitExceededError: If the user is over quota.
+    """
+    check_rate_limit(f"user:{user.id}", user.role)
+
+
+async def limit_by_client(request: Request) -> None:
+    """
+    FastAPI dependency applying the anonymous quota, keyed by client address.
+
+    Raises:
+        RateLimitExceededError: If the client is over quota.
+    """
+    check_rate_limit(client_key(request))
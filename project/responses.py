@@ -0,0 +1,121 @@
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple, Type
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encodes plain JSON-compatible data, with orjson when it is installed.
+
+    Args:
+        content (Any): The data to encode.
+
+    Returns:
+        bytes: The UTF-8 JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+class ModelResponse(Response):
+    """
+    JSON response serialised straight from a pydantic model by pydantic-core.
+
+    Returning a Response from a route makes FastAPI skip re-validating the value against the route's
+    ``response_model``, so a model a service already built is encoded exactly once. The
+    ``response_model`` is still declared on the route for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return dumps(content)
+
+
+def error_response(
+    message: str, status_code: int, headers: Optional[Dict[str, str]] = None
+) -> ModelResponse:
+    """
+    Builds the ``{"error": ...}`` body every endpoint uses for failures.
+
+    Args:
+        message (str): The error message.
+        status_code (int): The HTTP status code.
+        headers (Optional[Dict[str, str]]): Extra response headers, e.g. Retry-After.
+
+    Returns:
+        ModelResponse: The error response.
+    """
+    return ModelResponse({"error": message}, status_code=status_code, headers=headers)
+
+
+_error_statuses: Dict[Type[Exception], Tuple[int, Optional[Dict[str, str]]]] = {}
+
+
+def register_error(
+    exc_type: Type[Exception],
+    status_code: int,
+    headers: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Maps a service exception type to an HTTP status instead of the default 500.
+
+    Args:
+        exc_type (Type[Exception]): The exception type, matched including subclasses.
+        status_code (int): The HTTP status code to answer with.
+        headers (Optional[Dict[str, str]]): Extra response headers, e.g. Retry-After. Headers set on the
+            exception's ``headers`` attribute are added to these.
+    """
+    _error_statuses[exc_type] = (status_code, headers)
+
+
+async def _mapped_error(request: Request, exc: Exception) -> Response:
+    for exc_type in type(exc).__mro__:
+        if exc_type in _error_statuses:
+            status_code, headers = _error_statuses[exc_type]
+            # Exceptions may carry per-instance headers, e.g. a computed Retry-After.
+            extra = getattr(exc, "headers", None)
+            if extra:
+                headers = {**(headers or {}), **extra}
+            return error_response(str(exc), status_code, headers)
+    return await _unhandled_error(request, exc)
+
+
+async def _unhandled_error(request: Request, exc: Exception) -> Response:
+    logger.error(
+        "Error processing request %s %s",
+        request.method,
+        request.url.path,
+        exc_info=exc,
+    )
+    return error_response(str(exc), 500)
+
+
+def install_error_handlers(app: FastAPI) -> None:
+    """
+    Installs the application-wide exception handlers, so routes no longer wrap every service call in
+    try/except. Exceptions registered with register_error get their status code; anything else is logged
+    and answered with a 500 ``{"error": ...}`` body.
+
+    Args:
+        app (FastAPI): The application.
+    """
+    for exc_type in _error_statuses:
+        app.add_exception_handler(exc_type, _mapped_error)
+    app.add_exception_handler(Exception, _unhandled_error)
@@ -0,0 +1,109 @@
+from typing import Optional
+
+import project.authenticateRequest_service
+import project.BulkImportUsers_service
+import project.ExportUsers_service
+import project.ndjson
+import project.ping_socket
+import project.rate_limiting
+import project.responses
+import project.SendPingBatch_service
+import project.StreamUserMessages_service
+import project.token_verification
+from fastapi import APIRouter, Depends, Request, WebSocket
+from fastapi.responses import Response, StreamingResponse
+
+router = APIRouter()
+
+
+@router.post("/ping/batch", dependencies=[Depends(project.rate_limiting.limit_by_user)])
+async def api_post_SendPingBatch(
+    request: Request,
+    user: project.token_verification.AuthenticatedUser = Depends(
+        project.token_verification.require_access_token
+    ),
+) -> Response:
+    """
+    Receives a JSON array, or an application/x-ndjson stream, of user messages and streams back one 'pong: [user_message]' NDJSON line per message. The Security Module is verified once per batch.
+    """
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        user_messages = project.ndjson.iter_records(request.stream())
+    else:
+        try:
+            user_messages = await request.json()
+        except ValueError as e:
+            return project.responses.error_response(str(e), 400)
+        if not isinstance(user_messages, list):
+            return project.responses.error_response(
+                "Expected a JSON array of messages.", 422
+            )
+    res = await project.SendPingBatch_service.SendPingBatch(user_messages, user.id)
+    return StreamingResponse(res, media_type="application/x-ndjson")
+
+
+@router.websocket("/ping/ws")
+async def api_ws_ping(websocket: WebSocket, token: Optional[str] = None) -> None:
+    """
+    Answers every text frame with a 'pong: [user_message]' frame over one connection. The access token from /authenticate is passed as the ``token`` query parameter or a Bearer Authorization header, and is verified once per connection.
+    """
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(
+            " "
+        )
+        if scheme.lower() == "bearer":
+            token = credentials
+    await project.ping_socket.ping_socket_server.serve(websocket, token)
+
+
+@router.post("/users/bulk")
+async def api_post_BulkImportUsers(request: Request) -> Response:
+    """
+    Creates users from a text/csv or application/x-ndjson upload, processed as it streams in. Streams back an NDJSON report with one line per row that was not imported and a final summary line.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("text/csv"):
+        format = "csv"
+    elif content_type.startswith("application/x-ndjson"):
+        format = "ndjson"
+    else:
+        return project.responses.error_response(
+            "Expected a text/csv or application/x-ndjson body.", 415
+        )
+    res = await project.BulkImportUsers_service.BulkImportUsers(
+        request.stream(), format
+    )
+    return StreamingResponse(res, media_type="application/x-ndjson")
+
+
+@router.get("/users/export")
+async def api_get_ExportUsers(format: str = "ndjson") -> Response:
+    """
+    Streams every user as NDJSON, or as CSV with format=csv, in constant memory.
+    """
+    res = await project.ExportUsers_service.ExportUsers(format)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(res, media_type=media_type)
+
+
+@router.get("/users/{userId}/messages/stream")
+async def api_get_StreamUserMessages(userId: str) -> Response:
+    """
+    Streams the complete message history of a user as NDJSON, oldest first, in constant memory.
+    """
+    res = await project.StreamUserMessages_service.StreamUserMessages(userId)
+    return StreamingResponse(res, media_type="application/x-ndjson")
+
+
+@router.post(
+    "/authenticate",
+    response_model=project.authenticateRequest_service.AuthenticationResponse,
+    dependencies=[Depends(project.rate_limiting.limit_by_client)],
+)
+async def api_post_authenticateRequest(username: str, password: str) -> Response:
+    """
+    Verifies user credentials and issues a token if valid. Critical for securing access to the single 'pong' endpoint by ensuring only authenticated requests proceed.
+    """
+    res = await project.authenticateRequest_service.authenticateRequest(
+        username, password
+    )
+    return project.responses.ModelResponse(res)
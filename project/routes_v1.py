@@ -0,0 +1,96 @@
+from typing import Optional
+
+import prisma
+import prisma.enums
+import project.CreateUser_service
+import project.deleteUser_service
+import project.GetUserDetails_service
+import project.listUsers_service
+import project.ping_service
+import project.rate_limiting
+import project.responses
+import project.routes_shared
+import project.token_verification
+import project.updateUser_service
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+
+router = APIRouter()
+
+router.include_router(project.routes_shared.router)
+
+
+@router.post(
+    "/ping",
+    response_model=project.ping_service.PingResponse,
+    dependencies=[Depends(project.rate_limiting.limit_by_user)],
+)
+async def api_post_ping(
+    user_message: str,
+) -> Response:
+    """
+    Receives a message and responds with 'pong:' followed by the same message. The route verifies authentication token validity before processing to ensure security.
+    """
+    res = project.ping_service.ping(user_message)
+    return project.responses.ModelResponse(res)
+
+
+@router.delete(
+    "/users/{userId}", response_model=project.deleteUser_service.DeleteUserResponse
+)
+async def api_delete_deleteUser(
+    userId: str,
+) -> Response:
+    """
+    Removes a user from the system using their userID. Helps in cleaning up records and managing user lifecycle.
+    """
+    res = await project.deleteUser_service.deleteUser(userId)
+    return project.responses.ModelResponse(res)
+
+
+@router.post("/users", response_model=project.CreateUser_service.CreateUserResponse)
+async def api_post_CreateUser(name: str, email: str, password: str) -> Response:
+    """
+    Creates a new user by taking user details. It requires name, email, and password as input. The response includes the confirmation of user creation.
+    """
+    res = await project.CreateUser_service.CreateUser(name, email, password)
+    return project.responses.ModelResponse(res)
+
+
+@router.put(
+    "/users/{userId}", response_model=project.updateUser_service.UpdateUserResponse
+)
+async def api_put_updateUser(
+    userId: str, username: str, role: prisma.enums.UserRole
+) -> Response:
+    """
+    Updates existing user details. Requires complete user information in the payload. Employed by administrators to maintain up-to-date records.
+    """
+    res = await project.updateUser_service.updateUser(userId, username, role)
+    return project.responses.ModelResponse(res)
+
+
+@router.get("/users", response_model=project.listUsers_service.GetUsersResponse)
+async def api_get_listUsers(
+    page: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Response:
+    """
+    Retrieves a list of all users in the system. Accessible by administrators for monitoring and management purposes.
+    """
+    res = await project.listUsers_service.listUsers(page, limit, cursor)
+    return project.responses.ModelResponse(res)
+
+
+@router.get(
+    "/users/{userId}", response_model=project.GetUserDetails_service.UserDetailsResponse
+)
+async def api_get_GetUserDetails(
+    userId: str,
+) -> Response:
+    """
+    Fetches details of a specific user by user ID. The response includes full user details like name, email, role, and status.
+    """
+    res = await project.GetUserDetails_service.GetUserDetails(userId)
+    return project.responses.ModelResponse(res)
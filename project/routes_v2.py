@@ -0,0 +1,109 @@
+from typing import Optional
+
+import prisma
+import prisma.enums
+import project.createUser_service
+import project.DeleteUser_service
+import project.getUserDetails_service
+import project.GetUsers_service
+import project.rate_limiting
+import project.responses
+import project.routes_shared
+import project.SendPing_service
+import project.token_verification
+import project.UpdateUser_service
+import project.user_count
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+
+router = APIRouter()
+
+router.include_router(project.routes_shared.router)
+
+
+@router.post(
+    "/ping",
+    response_model=project.SendPing_service.PingResponse,
+    dependencies=[Depends(project.rate_limiting.limit_by_user)],
+)
+async def api_post_SendPing(
+    user_message: str,
+    user: project.token_verification.AuthenticatedUser = Depends(
+        project.token_verification.require_access_token
+    ),
+) -> Response:
+    """
+    Receives a user message and replies with 'pong: [user_message]'. It ensures the message is authentic by verifying with the Security Module.
+    """
+    res = await project.SendPing_service.SendPing(user_message, user.id)
+    return project.responses.ModelResponse(res)
+
+
+@router.delete(
+    "/users/{userId}", response_model=project.DeleteUser_service.DeleteUserResponse
+)
+async def api_delete_DeleteUser(
+    userId: str,
+) -> Response:
+    """
+    Deletes a specific user using the user ID. Success response confirms the deletion of the user.
+    """
+    res = await project.DeleteUser_service.DeleteUser(userId)
+    return project.responses.ModelResponse(res)
+
+
+@router.post("/users", response_model=project.createUser_service.CreateUserResponse)
+async def api_post_createUser(name: str, email: str, password: str) -> Response:
+    """
+    Creates a new user record. Expects user details in the request body and returns the created user's details. Used by administrators to add users to the system.
+    """
+    res = await project.createUser_service.createUser(name, email, password)
+    return project.responses.ModelResponse(res)
+
+
+@router.put(
+    "/users/{userId}",
+    response_model=project.UpdateUser_service.UpdateUserDetailsResponse,
+)
+async def api_put_UpdateUser(
+    userId: str, name: str, email: str, role: prisma.enums.UserRole
+) -> Response:
+    """
+    Updates a user's details. Acceptable fields for update are name, email, and role. The endpoint requires the user ID of the user whose details need to be updated.
+    """
+    res = await project.UpdateUser_service.UpdateUser(userId, name, email, role)
+    return project.responses.ModelResponse(res)
+
+
+@router.get("/users", response_model=project.GetUsers_service.UsersListResponse)
+async def api_get_GetUsers(
+    page: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    count_mode: Optional[project.user_count.CountMode] = None,
+) -> Response:
+    """
+    Retrieves a list of all users. This endpoint provides paginated user data. Each user's ID, name, and email are listed.
+    """
+    res = await project.GetUsers_service.GetUsers(
+        page, limit, cursor, include_total, count_mode
+    )
+    return project.responses.ModelResponse(res)
+
+
+@router.get(
+    "/users/{userId}", response_model=project.getUserDetails_service.UserDetailResponse
+)
+async def api_get_getUserDetails(
+    userId: str,
+    messages_limit: Optional[int] = None,
+    messages_cursor: Optional[str] = None,
+) -> Response:
+    """
+    Fetches detailed information about a specific user using their unique userID. Useful for detailed user profile views and audit purposes.
+    """
+    res = await project.getUserDetails_service.getUserDetails(
+        userId, messages_limit, messages_cursor
+    )
+    return project.responses.ModelResponse(res)
@@ -1,332 +1,121 @@
+import asyncio
+import importlib
 import logging
-from contextlib import asynccontextmanager
-from typing import Optional
-
-import prisma
-import prisma.enums
-import project.authenticateRequest_service
-import project.CreateUser_service
-import project.createUser_service
-import project.DeleteUser_service
-import project.deleteUser_service
-import project.GetUserDetails_service
-import project.getUserDetails_service
-import project.GetUsers_service
-import project.listUsers_service
-import project.ping_service
-import project.SendPing_service
-import project.UpdateUser_service
-import project.updateUser_service
+import os
+from contextlib import asynccontextmanager, suppress
+
+import project.change_feed
+import project.database
+import project.message_writer
+import project.metrics
+import project.password_hashing
+import project.query_tracing
+import project.rate_limiting
+import project.responses
 from fastapi import FastAPI
-from fastapi.encoders import jsonable_encoder
 from fastapi.responses import Response
 from prisma import Prisma
 
 logger = logging.getLogger(__name__)
 
-db_client = Prisma(auto_register=True)
+db_client = project.database.db_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db_client.connect()
+    change_feed = project.change_feed.start_listener()
+    if os.environ.get("MESSAGE_PERSISTENCE", "1") == "1":
+        project.message_writer.message_writer.start()
     yield
+    await project.message_writer.message_writer.stop(
+        float(os.environ.get("MESSAGE_DRAIN_TIMEOUT_SECONDS", "10"))
+    )
+    if change_feed is not None:
+        change_feed.cancel()
+        with suppress(asyncio.CancelledError):
+            await change_feed
     await db_client.disconnect()
+    project.password_hashing.password_hasher.shutdown()
+    if project.query_tracing.query_tracer.exporter is not None:
+        project.query_tracing.query_tracer.exporter.flush()
 
 
 app = FastAPI(
     title="Ping v2",
     lifespan=lifespan,
     description="single endpoint server that just replies with the pong: and the users message",
+    default_response_class=project.responses.ModelResponse,
 )
 
-
-@app.post("/ping", response_model=project.ping_service.PingResponse)
-async def api_post_ping(
-    user_message: str,
-) -> project.ping_service.PingResponse | Response:
-    """
-    Receives a message and responds with 'pong:' followed by the same message. The route verifies authentication token validity before processing to ensure security.
-    """
-    try:
-        res = project.ping_service.ping(user_message)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.delete(
-    "/users/{userId}", response_model=project.deleteUser_service.DeleteUserResponse
+project.responses.register_error(
+    project.password_hashing.HashingPoolSaturatedError, 503, {"Retry-After": "1"}
 )
-async def api_delete_deleteUser(
-    userId: str,
-) -> project.deleteUser_service.DeleteUserResponse | Response:
-    """
-    Removes a user from the system using their userID. Helps in cleaning up records and managing user lifecycle.
-    """
-    try:
-        res = await project.deleteUser_service.deleteUser(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+project.responses.register_error(project.rate_limiting.RateLimitExceededError, 429)
+project.responses.install_error_handlers(app)
 
+if project.query_tracing.ENABLED:
+    project.query_tracing.query_tracer.instrument(Prisma)
+    app.add_middleware(project.query_tracing.QueryTracingMiddleware)
 
-@app.delete(
-    "/users/{userId}", response_model=project.DeleteUser_service.DeleteUserResponse
-)
-async def api_delete_DeleteUser(
-    userId: str,
-) -> project.DeleteUser_service.DeleteUserResponse | Response:
-    """
-    Deletes a specific user using the user ID. Success response confirms the deletion of the user.
-    """
-    try:
-        res = await project.DeleteUser_service.DeleteUser(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+# Added last so it is the outermost middleware and sheds load before any other work is done.
+if project.rate_limiting.admission_limiter is not None:
+    app.add_middleware(
+        project.rate_limiting.AdmissionControlMiddleware,
+        limiter=project.rate_limiting.admission_limiter,
+    )
 
 
-@app.post("/users", response_model=project.CreateUser_service.CreateUserResponse)
-async def api_post_CreateUser(
-    name: str, email: str, password: str
-) -> project.CreateUser_service.CreateUserResponse | Response:
+@app.get("/metrics")
+async def api_get_metrics() -> Response:
     """
-    Creates a new user by taking user details. It requires name, email, and password as input. The response includes the confirmation of user creation.
+    Reports in-process counters such as the module state cache hit and miss rates, and the database
+    connection pool state.
     """
-    try:
-        res = await project.CreateUser_service.CreateUser(name, email, password)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    return project.responses.ModelResponse(await project.metrics.collect())
 
 
-@app.post("/ping", response_model=project.SendPing_service.PingResponse)
-async def api_post_SendPing(
-    user_message: str,
-) -> project.SendPing_service.PingResponse | Response:
+@app.get("/health/live")
+async def api_get_liveness() -> Response:
     """
-    Receives a user message and replies with 'pong: [user_message]'. It ensures the message is authentic by verifying with the Security Module.
+    Reports that the worker process is up.
     """
-    try:
-        res = await project.SendPing_service.SendPing(user_message)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    return project.responses.ModelResponse({"status": "ok"})
 
 
-@app.put(
-    "/users/{userId}", response_model=project.updateUser_service.UpdateUserResponse
-)
-async def api_put_updateUser(
-    userId: str, username: str, role: prisma.enums.UserRole
-) -> project.updateUser_service.UpdateUserResponse | Response:
+@app.get("/health/ready")
+async def api_get_readiness() -> Response:
     """
-    Updates existing user details. Requires complete user information in the payload. Employed by administrators to maintain up-to-date records.
+    Reports whether the worker can serve requests, failing fast with 503 when the database connection
+    pool is exhausted or the database does not answer.
     """
-    try:
-        res = await project.updateUser_service.updateUser(userId, username, role)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
+    ready, reason = await project.database.readiness()
+    if not ready:
+        return project.responses.error_response(reason, 503)
+    return project.responses.ModelResponse({"status": "ok"})
 
-@app.post("/users", response_model=project.createUser_service.CreateUserResponse)
-async def api_post_createUser(
-    name: str, email: str, password: str
-) -> project.createUser_service.CreateUserResponse | Response:
-    """
-    Creates a new user record. Expects user details in the request body and returns the created user's details. Used by administrators to add users to the system.
-    """
-    try:
-        res = await project.createUser_service.createUser(name, email, password)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
 
+# Unversioned paths keep serving the version existing clients were built against. They are mounted
+# first because Starlette matches routes in order and most traffic still uses them.
+UNVERSIONED_ALIAS = os.environ.get("API_UNVERSIONED_ALIAS", "v1")
 
-@app.get("/users", response_model=project.listUsers_service.GetUsersResponse)
-async def api_get_listUsers(
-    page: Optional[int], limit: Optional[int]
-) -> project.listUsers_service.GetUsersResponse | Response:
-    """
-    Retrieves a list of all users in the system. Accessible by administrators for monitoring and management purposes.
-    """
-    try:
-        res = await project.listUsers_service.listUsers(page, limit)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+if UNVERSIONED_ALIAS:
+    app.include_router(
+        importlib.import_module(f"project.routes_{UNVERSIONED_ALIAS}").router,
+        include_in_schema=False,
+    )
 
+# Each API version lives in its own router module, imported only when the version is enabled so a
+# worker serving only one version never loads the other version's services.
+API_VERSIONS = [
+    version.strip()
+    for version in os.environ.get("API_VERSIONS", "v1,v2").split(",")
+    if version.strip()
+]
 
-@app.get(
-    "/users/{userId}", response_model=project.GetUserDetails_service.UserDetailsResponse
-)
-async def api_get_GetUserDetails(
-    userId: str,
-) -> project.GetUserDetails_service.UserDetailsResponse | Response:
-    """
-    Fetches details of a specific user by user ID. The response includes full user details like name, email, role, and status.
-    """
-    try:
-        res = await project.GetUserDetails_service.GetUserDetails(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.get(
-    "/users/{userId}", response_model=project.getUserDetails_service.UserDetailResponse
-)
-async def api_get_getUserDetails(
-    userId: str,
-) -> project.getUserDetails_service.UserDetailResponse | Response:
-    """
-    Fetches detailed information about a specific user using their unique userID. Useful for detailed user profile views and audit purposes.
-    """
-    try:
-        res = await project.getUserDetails_service.getUserDetails(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.post(
-    "/authenticate",
-    response_model=project.authenticateRequest_service.AuthenticationResponse,
-)
-async def api_post_authenticateRequest(
-    username: str, password: str
-) -> project.authenticateRequest_service.AuthenticationResponse | Response:
-    """
-    Verifies user credentials and issues a token if valid. Critical for securing access to the single 'pong' endpoint by ensuring only authenticated requests proceed.
-    """
-    try:
-        res = await project.authenticateRequest_service.authenticateRequest(
-            username, password
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.put(
-    "/users/{userId}",
-    response_model=project.UpdateUser_service.UpdateUserDetailsResponse,
-)
-async def api_put_UpdateUser(
-    userId: str, name: str, email: str, role: prisma.enums.UserRole
-) -> project.UpdateUser_service.UpdateUserDetailsResponse | Response:
-    """
-    Updates a user's details. Acceptable fields for update are name, email, and role. The endpoint requires the user ID of the user whose details need to be updated.
-    """
-    try:
-        res = await project.UpdateUser_service.UpdateUser(userId, name, email, role)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.get("/users", response_model=project.GetUsers_service.UsersListResponse)
-async def api_get_GetUsers(
-    page: Optional[int], limit: Optional[int]
-) -> project.GetUsers_service.UsersListResponse | Response:
-    """
-    Retrieves a list of all users. This endpoint provides paginated user data. Each user's ID, name, and email are listed.
-    """
-    try:
-        res = await project.GetUsers_service.GetUsers(page, limit)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+for version in API_VERSIONS:
+    app.include_router(
+        importlib.import_module(f"project.routes_{version}").router,
+        prefix=f"/{version}",
+        tags=[version],
+    )
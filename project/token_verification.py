@@ -0,0 +1,175 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.authenticateRequest_service
+import project.metrics
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+from pydantic import BaseModel
+
+
+class AuthenticatedUser(BaseModel):
+    """
+    The caller identified by a verified access token.
+    """
+
+    id: str
+    username: str
+    role: prisma.enums.UserRole
+
+
+class InvalidTokenError(Exception):
+    """
+    Raised when an access token is malformed, expired, badly signed or belongs to an unknown user.
+    """
+
+
+class TokenVerifier:
+    """
+    Verifies access tokens issued by authenticateRequest, remembering the outcome of each successful check.
+
+    Entries are keyed by the SHA-256 digest of the token, evicted least-recently-used beyond
+    ``max_entries``, and never outlive the token's ``exp`` claim or ``max_age`` seconds, whichever
+    comes first. A cache hit skips both the signature check and the user lookup.
+    """
+
+    def __init__(self, max_entries: int, max_age: float) -> None:
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, AuthenticatedUser]]" = (
+            OrderedDict()
+        )
+
+    async def load_user(self, user_id: str) -> Optional[AuthenticatedUser]:
+        """
+        Looks up the user a token was issued to.
+
+        Args:
+            user_id (str): The token's ``sub`` claim.
+
+        Returns:
+            Optional[AuthenticatedUser]: The user, or None if it no longer exists.
+        """
+        user = await prisma.models.User.prisma().find_unique(where={"id": user_id})
+        if user is None:
+            return None
+        return AuthenticatedUser(id=user.id, username=user.username, role=user.role)
+
+    async def verify(self, token: str) -> AuthenticatedUser:
+        """
+        Verifies an access token.
+
+        Args:
+            token (str): The encoded JWT.
+
+        Returns:
+            AuthenticatedUser: The user the token was issued to.
+
+        Raises:
+            InvalidTokenError: If the token cannot be verified.
+        """
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        now = time.time()
+        entry = self._entries.get(digest)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry[1]
+            del self._entries[digest]
+        self.misses += 1
+        try:
+            claims = jwt.decode(
+                token,
+                project.authenticateRequest_service.SECRET_KEY,
+                algorithms=[project.authenticateRequest_service.ALGORITHM],
+            )
+        except JWTError as e:
+            self.rejected += 1
+            raise InvalidTokenError(str(e))
+        user = await self.load_user(claims.get("sub", ""))
+        if user is None:
+            self.rejected += 1
+            raise InvalidTokenError("Token subject does not exist.")
+        self._entries[digest] = (min(claims["exp"], now + self.max_age), user)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return user
+
+    def invalidate_user(self, user_id: str) -> None:
+        """
+        Forgets every verified token of a user, e.g. after the user was updated or deleted.
+
+        Args:
+            user_id (str): The user's unique identifier.
+        """
+        for digest in [
+            digest for digest, (_, user) in self._entries.items() if user.id == user_id
+        ]:
+            del self._entries[digest]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the verification counters.
+
+        Returns:
+            Dict[str, Any]: Cache size and hit, miss and rejection counts.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "rejected": self.rejected,
+        }
+
+
+token_verifier = TokenVerifier(
+    max_entries=int(os.environ.get("TOKEN_CACHE_MAX_ENTRIES", "10000")),
+    max_age=float(os.environ.get("TOKEN_CACHE_MAX_AGE_SECONDS", "300")),
+)
+
+project.metrics.register_collector("token_cache", token_verifier.stats)
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def require_access_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> AuthenticatedUser:
+    """
+    FastAPI dependency rejecting requests without a valid ``Authorization: Bearer`` access token.
+
+    Args:
+        credentials (Optional[HTTPAuthorizationCredentials]): The parsed Authorization header.
+
+    Returns:
+        AuthenticatedUser: The caller.
+
+    Raises:
+        HTTPException: 401 if the token is missing or invalid.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Missing access token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        return await token_verifier.verify(credentials.credentials)
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"}
+        )
@@ -2,6 +2,8 @@ from enum import Enum
 
 import prisma
 import prisma.models
+import project.token_verification
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -47,6 +49,8 @@ async def updateUser(userId: str, username: str, role: UserRole) -> UpdateUserRe
         await prisma.models.User.prisma().update(
             where={"id": userId}, data={"username": username, "role": role}
         )
+        project.token_verification.token_verifier.invalidate_user(userId)
+        await project.user_cache.user_cache.invalidate(userId)
         return UpdateUserResponse(success=True, message="User updated successfully.")
     except Exception as e:
         return UpdateUserResponse(
@@ -0,0 +1,210 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import prisma
+import prisma.enums
+import prisma.models
+import project.metrics
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+_MISSING = b""
+
+
+class CachedUser(BaseModel):
+    """
+    The columns of a User row that the user detail endpoints serve.
+    """
+
+    id: str
+    username: str
+    createdAt: datetime
+    updatedAt: datetime
+    role: prisma.enums.UserRole
+
+
+class InProcessBackend:
+    """
+    LRU + TTL store living in the worker's memory. Values are kept encoded so their size is known exactly.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            await self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.delete(key)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._bytes += len(key) + len(value)
+        while len(self._entries) > self.max_entries:
+            evicted, (_, old) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted) + len(old)
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(key) + len(entry[1])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+        }
+
+
+class RedisBackend:
+    """
+    Store shared by every worker, backed by Redis or any server speaking its protocol (Valkey, KeyDB, ...).
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "user:") -> None:
+        import redis.asyncio
+
+        self.prefix = prefix
+        self._client = redis.asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": None, "bytes": None}
+
+
+class UserCache:
+    """
+    Read-through cache of User rows keyed by id.
+
+    Unknown ids are cached too (negative caching) for ``negative_ttl`` seconds so repeated lookups of a
+    missing user do not reach the database. Entries are invalidated by the update and delete services.
+    """
+
+    def __init__(self, backend: Any, ttl: float, negative_ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._generation = 0
+
+    async def get_user(self, userId: str) -> Optional[CachedUser]:
+        """
+        Looks a user up, reading from the database only on a cache miss.
+
+        Args:
+            userId (str): The user's unique identifier.
+
+        Returns:
+            Optional[CachedUser]: The user, or None if no user has this id.
+        """
+        try:
+            cached = await self.backend.get(userId)
+        except Exception:
+            # A broken shared cache must not take the endpoint down with it.
+            self.errors += 1
+            logger.exception("User cache read failed")
+            cached = None
+        if cached is not None:
+            if cached == _MISSING:
+                self.negative_hits += 1
+                return None
+            self.hits += 1
+            return CachedUser.model_validate_json(cached)
+        self.misses += 1
+        generation = self._generation
+        user = await prisma.models.User.prisma().find_unique(where={"id": userId})
+        if user is None:
+            found, value, ttl = None, _MISSING, self.negative_ttl
+        else:
+            found = CachedUser(
+                id=user.id,
+                username=user.username,
+                createdAt=user.createdAt,
+                updatedAt=user.updatedAt,
+                role=user.role,
+            )
+            value, ttl = found.model_dump_json().encode("utf-8"), self.ttl
+        if generation != self._generation:
+            # The user changed while it was being read; the row may already be stale.
+            return found
+        try:
+            await self.backend.set(userId, value, ttl)
+        except Exception:
+            self.errors += 1
+            logger.exception("User cache write failed")
+        return found
+
+    async def invalidate(self, userId: str) -> None:
+        """
+        Drops a user from the cache. Call this whenever a user is updated or deleted.
+
+        Args:
+            userId (str): The user's unique identifier.
+        """
+        self._generation += 1
+        await self.backend.delete(userId)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the cache counters.
+
+        Returns:
+            Dict[str, Any]: The backend, hit/miss counts, hit ratio and the backend's size and memory use.
+        """
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            **self.backend.stats(),
+        }
+
+
+def _create_backend() -> Any:
+    if os.environ.get("USER_CACHE_BACKEND", "memory") == "redis":
+        return RedisBackend(
+            os.environ.get("USER_CACHE_REDIS_URL", "redis://localhost:6379/0")
+        )
+    return InProcessBackend(
+        max_entries=int(os.environ.get("USER_CACHE_MAX_ENTRIES", "10000"))
+    )
+
+
+user_cache = UserCache(
+    backend=_create_backend(),
+    ttl=float(os.environ.get("USER_CACHE_TTL_SECONDS", "60")),
+    negative_ttl=float(os.environ.get("USER_CACHE_NEGATIVE_TTL_SECONDS", "10")),
+)
+
+project.metrics.register_collector("user_cache", user_cache.stats)
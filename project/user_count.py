@@ -0,0 +1,82 @@
+import os
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+import prisma
+import prisma.models
+import project.metrics
+import project.module_cache
+
+
+class CountMode(Enum):
+    EXACT: str = "exact"
+    CACHED: str = "cached"
+    ESTIMATED: str = "estimated"
+
+
+class UserCounter:
+    """
+    Counts users for list endpoints without necessarily scanning the whole table.
+
+    ``exact`` runs ``COUNT(*)``; ``cached`` reuses an exact count for up to ``ttl`` seconds and is
+    invalidated when this worker creates or deletes a user; ``estimated`` reads the planner's row
+    estimate from ``pg_class.reltuples``, which is maintained by VACUUM/ANALYZE.
+    """
+
+    def __init__(self, default_mode: CountMode, ttl: float) -> None:
+        self.default_mode = default_mode
+        self.estimates = 0
+        self._cache = project.module_cache.TTLCache(ttl=ttl)
+
+    async def _exact(self) -> int:
+        return await prisma.models.User.prisma().count()
+
+    async def count(self, mode: Optional[CountMode] = None) -> Tuple[int, bool]:
+        """
+        Counts the users.
+
+        Args:
+            mode (Optional[CountMode]): How to count. Uses the configured default when omitted.
+
+        Returns:
+            Tuple[int, bool]: The count and whether it is guaranteed to be exact.
+        """
+        mode = mode or self.default_mode
+        if mode is CountMode.CACHED:
+            return await self._cache.get_or_load("users", self._exact), False
+        if mode is CountMode.ESTIMATED:
+            row = await prisma.get_client().query_first(
+                """SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = '"User"'::regclass"""
+            )
+            # reltuples is -1 (or 0 on older servers) until the table was first analyzed.
+            if row and row["estimate"] > 0:
+                self.estimates += 1
+                return row["estimate"], False
+        return await self._exact(), True
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached count. Call this whenever a user is created or deleted.
+        """
+        self._cache.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Reports the counter state.
+
+        Returns:
+            Dict[str, Any]: The default mode, the cached count's cache statistics and the number of estimates served.
+        """
+        return {
+            "default_mode": self.default_mode.value,
+            "estimates": self.estimates,
+            "cache": self._cache.stats(),
+        }
+
+
+user_counter = UserCounter(
+    default_mode=CountMode(os.environ.get("USER_COUNT_MODE", "cached")),
+    ttl=float(os.environ.get("USER_COUNT_TTL_SECONDS", "30")),
+)
+
+project.metrics.register_collector("user_count", user_counter.stats)